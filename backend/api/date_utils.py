@@ -0,0 +1,45 @@
+from fastapi import HTTPException
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+def _parse_ymd(value: str) -> Tuple[int, int, int]:
+    """Split a YYYY-MM-DD string into (year, month, day) without a regex"""
+    return int(value[0:4]), int(value[5:7]), int(value[8:10])
+
+def _is_ymd(value: str) -> bool:
+    """True for the plain YYYY-MM-DD shape sent by the frontend"""
+    return (len(value) == 10 and value[4] == '-' and value[7] == '-'
+            and (value[0:4] + value[5:7] + value[8:10]).isdigit())
+
+def to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Convert an aware datetime to naive UTC, matching the naive DateTime
+    columns; asyncpg rejects aware values for those. Naive values pass through.
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+def parse_query_date(value: Optional[str], end_of_day: bool = False, param: str = "date") -> Optional[datetime]:
+    """
+    Parse a date query parameter given as YYYY-MM-DD or full ISO format.
+    Plain dates resolve to the start of the day, or to 23:59:59 when
+    end_of_day is set. Raises a 400 for anything unparseable.
+    """
+    if not value:
+        return None
+    
+    try:
+        if 'T' in value:
+            return to_naive_utc(datetime.fromisoformat(value.replace('Z', '+00:00')))
+        
+        if _is_ymd(value):
+            # Fast path for the common case; datetime() still validates the ranges
+            if end_of_day:
+                return datetime(*_parse_ymd(value), 23, 59, 59)
+            return datetime(*_parse_ymd(value))
+        
+        time_part = "23:59:59" if end_of_day else "00:00:00"
+        return to_naive_utc(datetime.fromisoformat(f"{value}T{time_part}"))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {param} format: {value}. Use YYYY-MM-DD or ISO format.")
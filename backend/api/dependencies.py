@@ -1,85 +1,432 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from pydantic import SecretStr
+from sqlalchemy import Select, tuple_
 from sqlalchemy.orm import Session
-from database import get_db
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from enum import IntFlag
+from types import MappingProxyType
+from typing import Annotated, AsyncIterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+from database import SessionLocal, AsyncSessionLocal
+from api.schemas import PageParams
 from config import settings
+from cachetools import TTLCache
+from functools import lru_cache
+import base64
+import hashlib
+import hmac
+import jwt
 import logging
+import orjson
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
-security = HTTPBearer(auto_error=False)
+class _NoopBearer(HTTPBearer):
+    """
+    Bearer scheme that skips parsing the Authorization header. Used in DEBUG,
+    where get_current_user never looks at the credentials; it still registers
+    the Bearer scheme in the OpenAPI docs.
+    """
+    async def __call__(self, request: Request) -> Optional[HTTPAuthorizationCredentials]:
+        return None
+
+security = _NoopBearer(auto_error=False) if settings.DEBUG else HTTPBearer(auto_error=False)
+
+Creds = Annotated[Optional[HTTPAuthorizationCredentials], Depends(security)]
+
+class Role(IntFlag):
+    USER = 1
+    ADMIN = 2
+
+# Immutable per-process objects so the dependency hot path allocates nothing.
+# Shared exceptions are raised with a cleared traceback so it doesn't grow per request.
+_DEV_USER = MappingProxyType({"user_id": "dev_user", "role": "admin", "role_bits": Role.USER | Role.ADMIN})
+_AUTH_USER = MappingProxyType({"user_id": "authenticated_user", "role": "user", "role_bits": Role.USER})
+
+_MISSING_CREDS_EXC = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Authorization credentials required",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+_INVALID_TOKEN_EXC = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Invalid authentication credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+_ADMIN_FORBIDDEN_EXC = HTTPException(
+    status_code=status.HTTP_403_FORBIDDEN,
+    detail="Admin access required"
+)
+_INVALID_LIMIT_EXC = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="Limit must be between 1 and 1000"
+)
+_INVALID_OFFSET_EXC = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="Offset must be non-negative"
+)
+_INVALID_CURSOR_EXC = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="Malformed pagination cursor"
+)
+
+# Verified tokens keyed by a truncated SHA-256 of the token (never the raw token).
+# The short TTL bounds how long a revoked token keeps working. Tokens that failed
+# verification are cached too, so a client replaying a bad token costs one
+# signature check per TTL window.
+_JWT_CACHE = TTLCache(maxsize=10_000, ttl=settings.JWT_CACHE_TTL)
+_JWT_CACHE_LOCK = threading.Lock()
+
+class _CachedError:
+    """Cache marker for a token that recently failed verification"""
+
+# JWKS signing keys by key id. Filled at startup and refreshed off the event
+# loop on a miss, so token verification itself never does network I/O.
+# Entries expire with the JWKS client's own key lifespan.
+_SIGNING_KEYS = TTLCache(maxsize=64, ttl=3600)
+_SIGNING_KEYS_LOCK = threading.Lock()
+
+class _SigningKeyMissing(Exception):
+    """Raised when a token names a key id that isn't in _SIGNING_KEYS yet"""
+
+def prime_signing_keys(jwks: jwt.PyJWKClient) -> int:
+    """Fetch every key in the JWKS into the local key cache. Blocking; call at startup"""
+    keys = jwks.get_signing_keys()
+    with _SIGNING_KEYS_LOCK:
+        for signing_key in keys:
+            _SIGNING_KEYS[signing_key.key_id] = signing_key.key
+    return len(keys)
+
+def _fetch_signing_key(jwks: jwt.PyJWKClient, token: str) -> None:
+    """Fetch the key a token names from the JWKS endpoint. Blocking; run in the threadpool"""
+    try:
+        signing_key = jwks.get_signing_key_from_jwt(token)
+    except jwt.PyJWTError as e:
+        # Unknown key id or an unreachable JWKS endpoint; verification will fail
+        logger.debug("JWKS key lookup failed: %s", e)
+        return
+    with _SIGNING_KEYS_LOCK:
+        _SIGNING_KEYS[signing_key.key_id] = signing_key.key
+
+def _cached_signing_key(token: str):
+    """Look up a token's signing key in the local cache without any I/O"""
+    kid = jwt.get_unverified_header(token).get("kid")
+    with _SIGNING_KEYS_LOCK:
+        signing_key = _SIGNING_KEYS.get(kid)
+    if signing_key is None:
+        raise _SigningKeyMissing(kid)
+    return signing_key
+
+def _token_cache_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()[:16]
+
+def _verify_token(token: str, jwks: Optional[jwt.PyJWKClient] = None, key_missing_ok: bool = False):
+    """
+    Verify a JWT and return the user it identifies, skipping the signature
+    check for tokens verified within the last JWT_CACHE_TTL seconds.
+    With a JWKS client configured, the signing key comes from the local key
+    cache; a miss raises _SigningKeyMissing so the caller can fetch it off
+    the event loop, unless key_missing_ok is set (the key was just fetched
+    and still isn't there), in which case the token is rejected.
+    """
+    key = _token_cache_key(token)
+    with _JWT_CACHE_LOCK:
+        entry = _JWT_CACHE.get(key)
+    
+    if entry is not None:
+        if entry[0] is _CachedError:
+            logger.debug("Rejecting cached invalid token: %s", entry[1])
+            raise _INVALID_TOKEN_EXC.with_traceback(None)
+        
+        expires_at, user = entry
+        if expires_at > time.time():
+            return user
+    
+    try:
+        try:
+            signing_key = _cached_signing_key(token) if jwks else settings.JWT_PUBLIC_KEY
+        except _SigningKeyMissing as e:
+            if not key_missing_ok:
+                raise
+            raise jwt.InvalidKeyError(f"Unknown signing key id: {e}")
+        payload = jwt.decode(
+            token,
+            signing_key,
+            algorithms=settings.JWT_ALGORITHMS,
+            options={"require": ["exp", "iat", "sub"]},
+        )
+    except jwt.PyJWTError as e:
+        logger.debug("JWT verification failed: %s", e)
+        with _JWT_CACHE_LOCK:
+            _JWT_CACHE[key] = (_CachedError, str(e))
+        raise _INVALID_TOKEN_EXC.with_traceback(None)
+    
+    role = payload.get("role", "user")
+    user = MappingProxyType({
+        "user_id": payload["sub"],
+        "role": role,
+        "role_bits": Role.USER | Role.ADMIN if role == "admin" else Role.USER,
+    })
+    with _JWT_CACHE_LOCK:
+        _JWT_CACHE[key] = (payload["exp"], user)
+    
+    return user
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+def _resolve_user(credentials: Optional[HTTPAuthorizationCredentials], jwks: Optional[jwt.PyJWKClient] = None,
+                  key_missing_ok: bool = False):
     """
-    Get current user (placeholder for future authentication)
-    For now, this is a simple implementation that can be extended
+    Resolve the user for a request. Must stay free of awaits and blocking I/O:
+    it runs inline on the event loop from the async dependencies below.
+    Raises _SigningKeyMissing when the token's JWKS key isn't cached yet.
     """
     # For development, we'll skip authentication
-    # In production, you would verify JWT tokens here
     if settings.DEBUG:
-        return {"user_id": "dev_user", "role": "admin"}
+        return _DEV_USER
     
     if not credentials:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Authorization credentials required",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _MISSING_CREDS_EXC.with_traceback(None)
     
-    # TODO: Implement proper JWT verification
-    # For now, accept any token in production
-    return {"user_id": "authenticated_user", "role": "user"}
+    # Without an issuer key configured, accept any token
+    if not settings.JWT_PUBLIC_KEY and jwks is None:
+        return _AUTH_USER
+    
+    return _verify_token(credentials.credentials, jwks, key_missing_ok)
 
-async def get_admin_user(current_user: dict = Depends(get_current_user)):
+async def _authenticate(request: Request, credentials: Optional[HTTPAuthorizationCredentials]):
+    """
+    Resolve the user inline, fetching an uncached JWKS key (e.g. after a key
+    rotation) in the threadpool first so the event loop never blocks on it
+    """
+    jwks = getattr(request.app.state, "jwks", None)
+    try:
+        return _resolve_user(credentials, jwks)
+    except _SigningKeyMissing:
+        await run_in_threadpool(_fetch_signing_key, jwks, credentials.credentials)
+        return _resolve_user(credentials, jwks, key_missing_ok=True)
+
+# Only digests of the configured keys are kept in memory. Comparing fixed-size
+# digests with hmac.compare_digest makes the check independent of where (or
+# whether) the candidate differs from a stored key.
+_API_KEY_DIGESTS = tuple(hashlib.sha256(key.encode()).digest() for key in settings.API_KEYS)
+
+def _check_api_key(api_key: Optional[str]) -> bool:
+    """Check an API key in constant time without awaiting anything"""
+    if not api_key:
+        return False
+    
+    # Without configured keys, accept any reasonably long key (development)
+    if not _API_KEY_DIGESTS:
+        return len(api_key) > 10
+    
+    candidate = hashlib.sha256(api_key.encode()).digest()
+    # Compare against every stored key so timing doesn't reveal which one matched
+    matches = [hmac.compare_digest(candidate, digest) for digest in _API_KEY_DIGESTS]
+    return any(matches)
+
+# The dependencies below are kept as coroutines on purpose: FastAPI awaits
+# async dependencies inline, while plain `def` dependencies are dispatched
+# to the threadpool on every request.
+
+async def get_current_user(request: Request, credentials: Creds):
+    """
+    Get current user, verifying the bearer token as a JWT outside of DEBUG mode
+    """
+    return await _authenticate(request, credentials)
+
+CurrentUser = Annotated[Mapping, Depends(get_current_user)]
+
+async def get_admin_user(current_user: CurrentUser):
     """
     Ensure the current user is an admin
     """
-    if current_user.get("role") != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin access required"
-        )
+    if not current_user["role_bits"] & Role.ADMIN:
+        raise _ADMIN_FORBIDDEN_EXC.with_traceback(None)
     return current_user
 
-async def validate_api_key(api_key: str = None):
+AdminUser = Annotated[Mapping, Depends(get_admin_user)]
+
+async def validate_api_key(
+    api_key: Annotated[Optional[SecretStr], Header(alias="X-API-Key")] = None,
+) -> bool:
     """
-    Validate API key for external integrations
+    Validate API key for external integrations, read from the X-API-Key header.
+    SecretStr keeps the raw key out of reprs, tracebacks and logs.
     """
-    if not api_key:
+    if api_key is None:
         return False
-    
-    # For now, accept any non-empty API key
-    # In production, validate against stored API keys
-    return len(api_key) > 10
+    return _check_api_key(api_key.get_secret_value())
 
 def get_db_session() -> Session:
     """
     Get database session with error handling
     """
-    db = next(get_db())
+    db = SessionLocal()
     try:
         yield db
-    except Exception as e:
-        logger.error(f"Database session error: {e}")
+    except SQLAlchemyError as e:
+        # Only DB errors need an explicit rollback; close() discards any
+        # open transaction for everything else (e.g. HTTPException)
+        logger.error("Database session error: %s", e, exc_info=True)
         db.rollback()
         raise
     finally:
         db.close()
 
-def validate_pagination(limit: int = 20, offset: int = 0):
+async def get_async_db_session() -> AsyncIterator[AsyncSession]:
+    """
+    Get a pooled async database session with error handling.
+    Commits when the request completes without error.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except SQLAlchemyError as e:
+            logger.error("Database session error: %s", e, exc_info=True)
+            await db.rollback()
+            raise
+
+DbSession = Annotated[Session, Depends(get_db_session)]
+AsyncDbSession = Annotated[AsyncSession, Depends(get_async_db_session)]
+
+@lru_cache(maxsize=256)
+def _paginate(limit: int, offset: int) -> Mapping[str, int]:
     """
-    Validate pagination parameters
+    Validate and build pagination parameters. Only valid pairs are memoized;
+    invalid ones raise and are re-checked on the next call.
     """
     if limit <= 0 or limit > 1000:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Limit must be between 1 and 1000"
-        )
+        raise _INVALID_LIMIT_EXC.with_traceback(None)
     
     if offset < 0:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Offset must be non-negative"
-        )
+        raise _INVALID_OFFSET_EXC.with_traceback(None)
+    
+    return MappingProxyType({"limit": limit, "offset": offset})
+
+def validate_pagination(limit: int = 20, offset: int = 0):
+    """
+    Validate pagination parameters.
+    Kept for existing callers; new endpoints should take `page: PageQuery`.
+    """
+    return _paginate(limit, offset)
+
+PaginationParams = Annotated[Mapping[str, int], Depends(validate_pagination)]
+
+# Pagination as a query model: FastAPI reads the field bounds from PageParams
+# and rejects out-of-range values with a 422 before the endpoint runs
+PageQuery = Annotated[PageParams, Depends()]
+
+class AdminListContext(NamedTuple):
+    user: Mapping
+    limit: int
+    offset: int
+    db: Session
+
+async def admin_list_context(
+    request: Request,
+    credentials: Creds,
+    db: DbSession,
+    limit: int = 20,
+    offset: int = 0,
+) -> AdminListContext:
+    """
+    Admin check and pagination for admin list endpoints in a single dependency.
+    Runs the same checks as get_admin_user + validate_pagination inline, so the
+    solver resolves one node here instead of three.
+    """
+    user = await _authenticate(request, credentials)
+    if not user["role_bits"] & Role.ADMIN:
+        raise _ADMIN_FORBIDDEN_EXC.with_traceback(None)
+    
+    page = _paginate(limit, offset)
+    return AdminListContext(user, page["limit"], page["offset"], db)
+
+AdminListCtx = Annotated[AdminListContext, Depends(admin_list_context)]
+
+def encode_cursor(*key) -> str:
+    """
+    Encode the keyset of the last returned row into an opaque cursor.
+    Routers fetch limit + 1 rows and pass the key of the last row kept,
+    e.g. encode_cursor(article.id) or encode_cursor(article.published_date, article.id)
+    """
+    return base64.urlsafe_b64encode(orjson.dumps(key)).decode("ascii")
+
+def decode_cursor(cursor: str) -> Tuple:
+    """
+    Decode an opaque cursor into its keyset tuple: (last_id,) or (last_created_at, last_id)
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = orjson.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except ValueError:
+        raise _INVALID_CURSOR_EXC.with_traceback(None)
+    
+    if not isinstance(key, list) or len(key) not in (1, 2):
+        raise _INVALID_CURSOR_EXC.with_traceback(None)
+    
+    last_id = key[-1]
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise _INVALID_CURSOR_EXC.with_traceback(None)
+    
+    if len(key) == 1:
+        return (last_id,)
+    
+    try:
+        last_created_at = datetime.fromisoformat(key[0])
+    except (TypeError, ValueError):
+        raise _INVALID_CURSOR_EXC.with_traceback(None)
+    
+    return (last_created_at, last_id)
+
+def validate_cursor_pagination(limit: int = 20, cursor: Optional[str] = None):
+    """
+    Validate keyset pagination parameters.
+    Routers filter on WHERE key > :cursor ORDER BY key LIMIT :limit + 1 and
+    return (items, next_cursor) instead of scanning past an OFFSET.
+    """
+    if limit <= 0 or limit > 1000:
+        raise _INVALID_LIMIT_EXC.with_traceback(None)
+    
+    return {"limit": limit, "cursor": decode_cursor(cursor) if cursor else None}
+
+CursorPaginationParams = Annotated[dict, Depends(validate_cursor_pagination)]
+
+async def fetch_keyset_page(
+    db: AsyncSession,
+    stmt: Select,
+    key_columns: Sequence,
+    page: Mapping,
+) -> Tuple[List, Optional[str]]:
+    """
+    Run a keyset-paginated ORM SELECT and return (items, next_cursor).
+    `key_columns` must be unique together, e.g. (Article.id,) or
+    (Article.published_date, Article.id), matching the cursor's shape.
+    Rows are streamed from a server-side cursor instead of being buffered.
+    """
+    limit = page["limit"]
+    cursor = page["cursor"]
+    
+    if cursor is not None:
+        if len(cursor) != len(key_columns):
+            raise _INVALID_CURSOR_EXC.with_traceback(None)
+        if len(key_columns) == 1:
+            stmt = stmt.where(key_columns[0] > cursor[0])
+        else:
+            stmt = stmt.where(tuple_(*key_columns) > tuple_(*cursor))
+    
+    stmt = stmt.order_by(*key_columns).limit(limit + 1)
+    result = await db.stream(stmt)
+    items = [item async for item in result.scalars()]
+    
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor(*(getattr(last, column.key) for column in key_columns))
     
-    return {"limit": limit, "offset": offset} 
\ No newline at end of file
+    return items, next_cursor
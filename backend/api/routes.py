@@ -1,51 +1,134 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, desc
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, load_only
+from sqlalchemy import func, and_, desc, distinct, select
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator
+from functools import lru_cache
 
-from database import get_db
+from database import get_async_db
 from models import Article, NewsSource, TopicTrend, TopicPrediction
+from api.date_utils import parse_query_date
 from api.schemas import (
-    ArticleResponse, NewsSearchQuery, TrendQuery,
+    NewsSearchQuery, TrendQuery,
     TopicListResponse, CountryTopicsResponse, LiveTrendsResponse,
-    PredictionResponse, TopicTrendResponse
+    PredictionResponse, TrendListAdapter
 )
 from news_aggregator import news_aggregator
-from api.sentiment_api import router as sentiment_router
+from cache import (
+    cache_key, cache_get_json, cache_set_json, cache_invalidate,
+    acquire_lock, release_lock, get_lock_owner
+)
+from api.sentiment_api import router as sentiment_router, clear_analysis_cache
 from config import settings
+from cachetools import TTLCache
+import numpy as np
+import orjson
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Cache lifetimes (seconds) for aggregate endpoints; the underlying data only
+# changes when news is re-fetched, and /refresh clears the cache
+LIVE_CACHE_TTL = min(settings.NEWS_FETCH_INTERVAL, 60)
+AGGREGATE_CACHE_TTL = 300
+ANALYSIS_CACHE_TTL = settings.NEWS_FETCH_INTERVAL
+
+# Only one refresh runs at a time; these keys live outside the response
+# cache namespace so invalidation leaves them alone
+REFRESH_LOCK_KEY = "trendpulse:refresh:lock"
+REFRESH_LAST_KEY = "trendpulse:refresh:last"
+REFRESH_LOCK_TTL = 600
+REFRESH_JOB_KEY = "trendpulse:refresh:{job_id}"
+REFRESH_JOB_TTL = 3600
+
+# Local copy of refresh job status, for when Redis isn't configured
+_refresh_jobs = TTLCache(maxsize=256, ttl=REFRESH_JOB_TTL)
+
+# Search terms shorter than this use substring matching instead of
+# full-text search, which would drop them as stop words or fragments
+MIN_FTS_QUERY_LENGTH = 3
+
+# Search pages larger than this are streamed, fetching rows in batches
+STREAM_PAGE_THRESHOLD = 100
+STREAM_YIELD_PER = 200
+
+# Columns read by article_payload(); content and the JSON columns stay unloaded
+ARTICLE_LIST_COLUMNS = (
+    Article.id, Article.title, Article.url, Article.country,
+    Article.published_date, Article.sentiment_score, Article.primary_theme
+)
+SOURCE_NAME_ONLY = selectinload(Article.source).load_only(NewsSource.name)
+
+# Topic lookup tables, built once; substring candidates are tried longest first
+_TOPIC_LOWER = {t.lower(): t for t in settings.NEWS_TOPICS}
+_TOPIC_SUBSTR = sorted(_TOPIC_LOWER.items(), key=lambda kv: -len(kv[0]))
+
+# Every fragment of every topic name mapped to its topic, so a partial
+# query like "tech" resolves with one dict lookup instead of a scan
+_TOPIC_FRAGMENTS: Dict[str, str] = {}
+for _lower_topic, _canonical in _TOPIC_SUBSTR:
+    for _i in range(len(_lower_topic)):
+        for _j in range(_i + 1, len(_lower_topic) + 1):
+            _TOPIC_FRAGMENTS.setdefault(_lower_topic[_i:_j], _canonical)
+
+@lru_cache(maxsize=256)
+def match_topic(topic: str) -> Optional[str]:
+    """Resolve a topic from the URL/query to its configured name, allowing partial matches"""
+    query = topic.lower()
+    matched = _TOPIC_LOWER.get(query) or _TOPIC_FRAGMENTS.get(query)
+    if matched:
+        return matched
+    
+    # Queries that contain a whole topic name, e.g. "politics & elections 2024"
+    for lower_topic, canonical in _TOPIC_SUBSTR:
+        if lower_topic in query:
+            return canonical
+    return None
+
 # Include sentiment analysis routes under /sentiment
 router.include_router(sentiment_router, prefix="/sentiment")
 
 @router.get("/topics", response_model=TopicListResponse)
-async def get_topics(db: Session = Depends(get_db)):
+async def get_topics(db: AsyncSession = Depends(get_async_db)):
     """Get list of all available topics"""
     try:
+        key = cache_key("topics")
+        cached = await cache_get_json(key)
+        if cached is not None:
+            return cached
+        
         # Always return the configured topics, even if database is not available
         available_topics = settings.NEWS_TOPICS
         
-        # Try to get topic counts from database if available
-        topic_counts = {}
+        # Try to get topic counts from database if available (single GROUP BY)
+        topic_counts = {topic: 0 for topic in settings.NEWS_TOPICS}
         try:
-            for topic in settings.NEWS_TOPICS:
-                count = db.query(Article).filter(Article.primary_theme == topic).count()
-                topic_counts[topic] = count
+            rows = (await db.execute(
+                select(Article.primary_theme, func.count(Article.id))
+                .where(Article.primary_theme.in_(settings.NEWS_TOPICS))
+                .group_by(Article.primary_theme)
+            )).all()
+            topic_counts.update(rows)
         except Exception as db_error:
             logger.warning(f"Could not get topic counts from database: {db_error}")
-            # Set default counts to 0
-            topic_counts = {topic: 0 for topic in settings.NEWS_TOPICS}
+            key = None
         
-        return TopicListResponse(
+        response = TopicListResponse(
             topics=available_topics,
-            total_count=len(available_topics)
+            total_count=len(available_topics),
+            topic_counts=topic_counts
         )
+        
+        # Only cache real counts, not the zeros returned when the DB is down
+        if key:
+            await cache_set_json(key, response, AGGREGATE_CACHE_TTL)
+        
+        return response
     except Exception as e:
         logger.error(f"Error getting topics: {e}")
         # Return configured topics as fallback
@@ -61,63 +144,40 @@ async def get_topic_trends(
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
     limit: int = Query(100, le=1000),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get trend data for a specific topic"""
     try:
         # Validate topic - allow partial matches
-        matched_topic = None
-        for available_topic in settings.NEWS_TOPICS:
-            if topic.lower() in available_topic.lower() or available_topic.lower() in topic.lower():
-                matched_topic = available_topic
-                break
+        matched_topic = match_topic(topic)
         
         if not matched_topic:
             raise HTTPException(status_code=404, detail=f"Topic not found. Available topics: {settings.NEWS_TOPICS}")
         
         # Convert date strings to datetime objects
-        start_datetime = None
-        end_datetime = None
-        
-        if start_date:
-            try:
-                # Handle different date formats
-                if 'T' in start_date:
-                    start_datetime = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-                else:
-                    # Assume it's just a date, add time component
-                    start_datetime = datetime.fromisoformat(f"{start_date}T00:00:00")
-            except ValueError as e:
-                raise HTTPException(status_code=400, detail=f"Invalid start_date format: {start_date}. Use YYYY-MM-DD or ISO format.")
-        
-        if end_date:
-            try:
-                # Handle different date formats
-                if 'T' in end_date:
-                    end_datetime = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-                else:
-                    # Assume it's just a date, add end of day time component
-                    end_datetime = datetime.fromisoformat(f"{end_date}T23:59:59")
-            except ValueError as e:
-                raise HTTPException(status_code=400, detail=f"Invalid end_date format: {end_date}. Use YYYY-MM-DD or ISO format.")
+        start_datetime = parse_query_date(start_date, param="start_date")
+        end_datetime = parse_query_date(end_date, end_of_day=True, param="end_date")
         
         # Try to build query
         try:
-            query = db.query(TopicTrend).filter(TopicTrend.theme == matched_topic)
+            query = select(TopicTrend).where(TopicTrend.theme == matched_topic)
             
             if country:
-                query = query.filter(TopicTrend.country == country)
+                query = query.where(TopicTrend.country == country)
             
             if start_datetime:
-                query = query.filter(TopicTrend.date >= start_datetime)
+                query = query.where(TopicTrend.date >= start_datetime)
             
             if end_datetime:
-                query = query.filter(TopicTrend.date <= end_datetime)
+                query = query.where(TopicTrend.date <= end_datetime)
             
             # Get trends ordered by date
-            trends = query.order_by(desc(TopicTrend.date)).limit(limit).all()
+            trends = (await db.scalars(query.order_by(desc(TopicTrend.date)).limit(limit))).all()
             
-            return [TopicTrendResponse.from_orm(trend) for trend in trends]
+            return TrendListAdapter.dump_python(
+                TrendListAdapter.validate_python(trends, from_attributes=True),
+                mode='json'
+            )
             
         except Exception as db_error:
             logger.warning(f"Database query failed: {db_error}")
@@ -136,31 +196,13 @@ async def get_country_topics(
     country: str,
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get topics by country"""
     try:
         # Convert date strings to datetime objects
-        start_datetime = None
-        end_datetime = None
-        
-        if start_date:
-            try:
-                if 'T' in start_date:
-                    start_datetime = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-                else:
-                    start_datetime = datetime.fromisoformat(f"{start_date}T00:00:00")
-            except ValueError:
-                raise HTTPException(status_code=400, detail=f"Invalid start_date format: {start_date}")
-        
-        if end_date:
-            try:
-                if 'T' in end_date:
-                    end_datetime = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-                else:
-                    end_datetime = datetime.fromisoformat(f"{end_date}T23:59:59")
-            except ValueError:
-                raise HTTPException(status_code=400, detail=f"Invalid end_date format: {end_date}")
+        start_datetime = parse_query_date(start_date, param="start_date")
+        end_datetime = parse_query_date(end_date, end_of_day=True, param="end_date")
         
         # Set default date range if not provided
         if not end_datetime:
@@ -169,23 +211,24 @@ async def get_country_topics(
             start_datetime = end_datetime - timedelta(days=30)
         
         # Get topic trends for the country
-        trends = (db.query(TopicTrend)
-                 .filter(
-                     and_(
-                         TopicTrend.country == country,
-                         TopicTrend.date >= start_datetime,
-                         TopicTrend.date <= end_datetime
-                     )
-                 )
-                 .order_by(desc(TopicTrend.trend_score))
-                 .all())
+        trends = (await db.scalars(
+            select(TopicTrend)
+            .where(
+                and_(
+                    TopicTrend.country == country,
+                    TopicTrend.date >= start_datetime,
+                    TopicTrend.date <= end_datetime
+                )
+            )
+            .order_by(desc(TopicTrend.trend_score))
+        )).all()
         
         if not trends:
             raise HTTPException(status_code=404, detail="No data found for this country")
         
         return CountryTopicsResponse(
             country=country,
-            topics=[TopicTrendResponse.from_orm(trend) for trend in trends],
+            topics=TrendListAdapter.validate_python(trends, from_attributes=True),
             date_range={
                 "start_date": start_datetime,
                 "end_date": end_datetime
@@ -203,75 +246,79 @@ async def get_topic_analysis(
     topic: str,
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get comprehensive analysis for a specific topic"""
     try:
         # Validate topic
-        matched_topic = None
-        for available_topic in settings.NEWS_TOPICS:
-            if topic.lower() in available_topic.lower() or available_topic.lower() in topic.lower():
-                matched_topic = available_topic
-                break
+        matched_topic = match_topic(topic)
         
         if not matched_topic:
             raise HTTPException(status_code=404, detail=f"Topic not found. Available topics: {settings.NEWS_TOPICS}")
         
         # Convert date strings to datetime objects
-        start_datetime = None
-        end_datetime = None
-        
-        if start_date:
-            try:
-                if 'T' in start_date:
-                    start_datetime = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-                else:
-                    start_datetime = datetime.fromisoformat(f"{start_date}T00:00:00")
-            except ValueError:
-                raise HTTPException(status_code=400, detail=f"Invalid start_date format: {start_date}")
-        
-        if end_date:
-            try:
-                if 'T' in end_date:
-                    end_datetime = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-                else:
-                    end_datetime = datetime.fromisoformat(f"{end_date}T23:59:59")
-            except ValueError:
-                raise HTTPException(status_code=400, detail=f"Invalid end_date format: {end_date}")
-        
-        # Set default date range if not provided (last 30 days)
+        start_datetime = parse_query_date(start_date, param="start_date")
+        end_datetime = parse_query_date(end_date, end_of_day=True, param="end_date")
+        
+        # Set default date range if not provided (last 30 days). Defaults are
+        # aligned to whole days so repeated requests share a cache entry.
         if not end_datetime:
-            end_datetime = datetime.now()
+            end_datetime = datetime.now().replace(hour=23, minute=59, second=59, microsecond=0)
         if not start_datetime:
-            start_datetime = end_datetime - timedelta(days=30)
-        
-        # Get trend data for the topic
-        trends = (db.query(TopicTrend)
-                 .filter(
-                     and_(
-                         TopicTrend.theme == matched_topic,
-                         TopicTrend.date >= start_datetime,
-                         TopicTrend.date <= end_datetime
-                     )
-                 )
-                 .order_by(TopicTrend.date)
-                 .all())
-        
-        # Get articles for the topic (for top stories and additional analysis)
-        articles = (db.query(Article)
-                   .filter(
-                       and_(
-                           Article.primary_theme == matched_topic,
-                           Article.published_date >= start_datetime,
-                           Article.published_date <= end_datetime
-                       )
-                   )
-                   .order_by(desc(Article.published_date))
-                   .all())
+            start_datetime = (end_datetime - timedelta(days=30)).replace(hour=0, minute=0, second=0, microsecond=0)
+        
+        key = cache_key("analysis", matched_topic, start_datetime.isoformat(), end_datetime.isoformat())
+        cached = await cache_get_json(key)
+        if cached is not None:
+            return cached
+        
+        # Aggregate the articles in the database; only the 5 top stories
+        # are loaded as full rows
+        in_window = and_(
+            Article.primary_theme == matched_topic,
+            Article.published_date >= start_datetime,
+            Article.published_date <= end_datetime
+        )
+        day = func.date_trunc('day', Article.published_date)
+        
+        daily_rows = (await db.execute(
+            select(day, func.count(), func.avg(Article.sentiment_score))
+            .where(in_window)
+            .group_by(day)
+            .order_by(day)
+        )).all()
+        
+        country_rows = (await db.execute(
+            select(Article.country, func.count())
+            .where(in_window, Article.country.isnot(None))
+            .group_by(Article.country)
+            .order_by(func.count().desc())
+            .limit(10)
+        )).all()
+        
+        # AVG skips NULL sentiment scores
+        avg_sentiment, active_countries = (await db.execute(
+            select(func.avg(Article.sentiment_score), func.count(distinct(Article.country)))
+            .where(in_window)
+        )).one()
+        
+        # Sources are loaded up front with one IN query over the distinct
+        # source ids: lazy loads can't run on an async session.
+        top_articles = (await db.scalars(
+            select(Article)
+            .options(load_only(*ARTICLE_LIST_COLUMNS, Article.content), SOURCE_NAME_ONLY)
+            .where(in_window)
+            .order_by(desc(Article.published_date))
+            .limit(5)
+        )).all()
         
         # Calculate analysis metrics
-        analysis = calculate_topic_analysis(trends, articles, matched_topic, start_datetime, end_datetime)
+        analysis = calculate_topic_analysis(
+            daily_rows, country_rows, avg_sentiment, active_countries, top_articles,
+            matched_topic, start_datetime, end_datetime
+        )
         
+        await cache_set_json(key, analysis, ANALYSIS_CACHE_TTL)
         return analysis
         
     except HTTPException:
@@ -285,33 +332,20 @@ async def get_countries_trends(
     topic: Optional[str] = Query(None),
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get aggregated trend data for all countries for a specific topic (for map visualization)"""
     try:
         logger.info(f"Countries trends request - topic: {topic}, start_date: {start_date}, end_date: {end_date}")
         
+        key = cache_key("countries_trends", topic, start_date, end_date)
+        cached = await cache_get_json(key)
+        if cached is not None:
+            return cached
+        
         # Convert date strings to datetime objects
-        start_datetime = None
-        end_datetime = None
-        
-        if start_date:
-            try:
-                if 'T' in start_date:
-                    start_datetime = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-                else:
-                    start_datetime = datetime.fromisoformat(f"{start_date}T00:00:00")
-            except ValueError:
-                raise HTTPException(status_code=400, detail=f"Invalid start_date format: {start_date}")
-        
-        if end_date:
-            try:
-                if 'T' in end_date:
-                    end_datetime = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-                else:
-                    end_datetime = datetime.fromisoformat(f"{end_date}T23:59:59")
-            except ValueError:
-                raise HTTPException(status_code=400, detail=f"Invalid end_date format: {end_date}")
+        start_datetime = parse_query_date(start_date, param="start_date")
+        end_datetime = parse_query_date(end_date, end_of_day=True, param="end_date")
         
         # Set default date range if not provided (last 7 days)
         if not end_datetime:
@@ -319,8 +353,17 @@ async def get_countries_trends(
         if not start_datetime:
             start_datetime = end_datetime - timedelta(days=7)
         
-        # Build query
-        query = db.query(TopicTrend).filter(
+        # Aggregate per country in the database; NULL scores count as 0
+        # so the averages match a plain mean over all data points
+        total_articles = func.coalesce(func.sum(TopicTrend.article_count), 0)
+        query = select(
+            TopicTrend.country,
+            total_articles,
+            func.avg(func.coalesce(TopicTrend.trend_score, 0)),
+            func.avg(func.coalesce(TopicTrend.sentiment_avg, 0)),
+            func.max(TopicTrend.date),
+            func.count()
+        ).where(
             and_(
                 TopicTrend.date >= start_datetime,
                 TopicTrend.date <= end_datetime
@@ -328,67 +371,41 @@ async def get_countries_trends(
         )
         
         # Filter by topic if provided
+        matched_topic = None
         if topic:
             # Validate topic - allow partial matches
-            matched_topic = None
-            for available_topic in settings.NEWS_TOPICS:
-                if topic.lower() in available_topic.lower() or available_topic.lower() in topic.lower():
-                    matched_topic = available_topic
-                    break
+            matched_topic = match_topic(topic)
             
             if matched_topic:
-                query = query.filter(TopicTrend.theme == matched_topic)
+                query = query.where(TopicTrend.theme == matched_topic)
             else:
                 return []
         
-        # Get all trends
-        trends = query.all()
+        # Most active countries first
+        rows = (await db.execute(
+            query.group_by(TopicTrend.country).order_by(total_articles.desc())
+        )).all()
         
-        if not trends:
+        if not rows:
             # Fallback: Generate trend data from articles if no trends exist
             logger.info("No trends found, generating from articles...")
-            return generate_trends_from_articles_fallback(db, topic, start_datetime, end_datetime)
-        
-        # Aggregate by country
-        country_data = {}
-        for trend in trends:
-            country = trend.country
-            if country not in country_data:
-                country_data[country] = {
-                    'country': country,
-                    'article_count': 0,
-                    'trend_score': 0,
-                    'sentiment_avg': 0,
-                    'count': 0,
-                    'latest_date': trend.date
-                }
-            
-            data = country_data[country]
-            data['article_count'] += trend.article_count or 0
-            data['trend_score'] += trend.trend_score or 0
-            data['sentiment_avg'] += trend.sentiment_avg or 0
-            data['count'] += 1
-            
-            # Keep track of latest date
-            if trend.date > data['latest_date']:
-                data['latest_date'] = trend.date
-        
-        # Calculate averages and format response
-        result = []
-        for country, data in country_data.items():
-            if data['count'] > 0:
-                result.append({
-                    'country': country,
-                    'article_count': data['article_count'],
-                    'trend_score': data['trend_score'] / data['count'],
-                    'sentiment_avg': data['sentiment_avg'] / data['count'],
-                    'latest_date': data['latest_date'].isoformat(),
-                    'data_points': data['count']
-                })
-        
-        # Sort by article count (most active countries first)
-        result.sort(key=lambda x: x['article_count'], reverse=True)
+            result = await generate_trends_from_articles_fallback(db, matched_topic, start_datetime, end_datetime)
+            await cache_set_json(key, result, AGGREGATE_CACHE_TTL)
+            return result
+        
+        result = [
+            {
+                'country': country,
+                'article_count': article_count,
+                'trend_score': trend_score,
+                'sentiment_avg': sentiment_avg,
+                'latest_date': latest_date.isoformat(),
+                'data_points': data_points
+            }
+            for country, article_count, trend_score, sentiment_avg, latest_date, data_points in rows
+        ]
         
+        await cache_set_json(key, result, AGGREGATE_CACHE_TTL)
         return result
         
     except Exception as e:
@@ -398,77 +415,77 @@ async def get_countries_trends(
 @router.get("/live", response_model=LiveTrendsResponse)
 async def get_live_trends(
     limit: int = Query(10, le=50),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get real-time trending topics"""
     try:
+        key = cache_key("live", limit)
+        cached = await cache_get_json(key)
+        if cached is not None:
+            return cached
+        
         # Get recent trending topics (last 24 hours)
         cutoff_time = datetime.now() - timedelta(hours=24)
         
-        trending_topics = (db.query(TopicTrend)
-                          .filter(TopicTrend.created_at >= cutoff_time)
-                          .order_by(desc(TopicTrend.trend_score))
-                          .all())
-        
-        # Aggregate by topic to avoid duplicates
-        topic_aggregates = {}
-        for trend in trending_topics:
-            topic = trend.theme
-            if topic not in topic_aggregates:
-                topic_aggregates[topic] = {
-                    "topic": topic,
-                    "countries": [],
-                    "total_article_count": 0,
-                    "max_trend_score": 0,
-                    "avg_sentiment": 0,
-                    "sentiment_count": 0,
-                    "top_country": trend.country,
-                    "top_country_articles": trend.article_count
-                }
-            
-            agg = topic_aggregates[topic]
-            agg["countries"].append(trend.country)
-            agg["total_article_count"] += trend.article_count or 0
-            agg["max_trend_score"] = max(agg["max_trend_score"], trend.trend_score or 0)
-            
-            # Track sentiment
-            if trend.sentiment_avg is not None:
-                agg["avg_sentiment"] += trend.sentiment_avg
-                agg["sentiment_count"] += 1
-            
-            # Track top country (most articles)
-            if (trend.article_count or 0) > agg["top_country_articles"]:
-                agg["top_country"] = trend.country
-                agg["top_country_articles"] = trend.article_count or 0
+        # Aggregate per topic in the database and only fetch the top `limit`
+        max_trend_score = func.coalesce(func.max(TopicTrend.trend_score), 0)
+        topic_rows = (await db.execute(
+            select(
+                TopicTrend.theme,
+                func.coalesce(func.sum(TopicTrend.article_count), 0),
+                max_trend_score,
+                func.avg(TopicTrend.sentiment_avg),  # AVG skips NULL sentiment
+                func.count(distinct(TopicTrend.country))
+            )
+            .where(TopicTrend.created_at >= cutoff_time)
+            .group_by(TopicTrend.theme)
+            .order_by(max_trend_score.desc())
+            .limit(limit)
+        )).all()
+        
+        # Country with the most articles for each of those topics
+        top_countries = {}
+        if topic_rows:
+            top_country_rows = await db.execute(
+                select(TopicTrend.theme, TopicTrend.country)
+                .distinct(TopicTrend.theme)
+                .where(
+                    and_(
+                        TopicTrend.created_at >= cutoff_time,
+                        TopicTrend.theme.in_([row[0] for row in topic_rows])
+                    )
+                )
+                .order_by(
+                    TopicTrend.theme,
+                    TopicTrend.article_count.desc().nullslast(),
+                    desc(TopicTrend.trend_score)
+                )
+            )
+            top_countries = dict(top_country_rows.all())
         
         # Format trending topics data
-        trending_data = []
-        for topic, agg in topic_aggregates.items():
-            # Calculate average sentiment
-            avg_sentiment = None
-            if agg["sentiment_count"] > 0:
-                avg_sentiment = agg["avg_sentiment"] / agg["sentiment_count"]
-            
-            trending_data.append({
+        trending_data = [
+            {
                 "topic": topic,
-                "country": agg["top_country"],  # Show country with most articles
-                "trend_score": agg["max_trend_score"],
-                "article_count": agg["total_article_count"],
-                "change_24h": agg["max_trend_score"],  # Simplified for now
+                "country": top_countries.get(topic),  # Show country with most articles
+                "trend_score": trend_score,
+                "article_count": article_count,
+                "change_24h": trend_score,  # Simplified for now
                 "sentiment": avg_sentiment,
-                "countries_count": len(set(agg["countries"]))  # Number of countries
-            })
-        
-        # Sort by trend score and limit
-        trending_data.sort(key=lambda x: x["trend_score"], reverse=True)
-        trending_data = trending_data[:limit]
+                "countries_count": countries_count  # Number of countries
+            }
+            for topic, article_count, trend_score, avg_sentiment, countries_count in topic_rows
+        ]
         
-        return LiveTrendsResponse(
+        response = LiveTrendsResponse(
             trending_topics=trending_data,
             last_updated=datetime.now(),
             update_interval=settings.NEWS_FETCH_INTERVAL
         )
         
+        await cache_set_json(key, response, LIVE_CACHE_TTL)
+        return response
+        
     except Exception as e:
         logger.error(f"Error getting live trends: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -478,48 +495,61 @@ async def get_predictions(
     topic: Optional[str] = Query(None),
     country: Optional[str] = Query(None),
     limit: int = Query(20, le=100),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get ML trend predictions"""
     try:
+        # Latest trend score per (theme, country), for comparison
+        latest = select(
+            TopicTrend.theme,
+            TopicTrend.country,
+            TopicTrend.trend_score,
+            func.row_number().over(
+                partition_by=[TopicTrend.theme, TopicTrend.country],
+                order_by=TopicTrend.date.desc()
+            ).label('rn')
+        )
+        
         # Build query
-        query = db.query(TopicPrediction)
+        query = select(TopicPrediction)
         
         if topic:
-            query = query.filter(TopicPrediction.theme == topic)
+            query = query.where(TopicPrediction.theme == topic)
+            latest = latest.where(TopicTrend.theme == topic)
         
         if country:
-            query = query.filter(TopicPrediction.country == country)
-        
-        # Get recent predictions
-        predictions = (query.order_by(desc(TopicPrediction.created_at))
-                      .limit(limit)
-                      .all())
+            query = query.where(TopicPrediction.country == country)
+            latest = latest.where(TopicTrend.country == country)
+        
+        latest = latest.subquery()
+        
+        # Get recent predictions together with their current trend
+        rows = (await db.execute(
+            query.add_columns(latest.c.trend_score)
+            .outerjoin(
+                latest,
+                and_(
+                    latest.c.theme == TopicPrediction.theme,
+                    latest.c.country == TopicPrediction.country,
+                    latest.c.rn == 1
+                )
+            )
+            .order_by(desc(TopicPrediction.created_at))
+            .limit(limit)
+        )).all()
         
         # Format response
-        prediction_data = []
-        for pred in predictions:
-            # Get current trend for comparison
-            current_trend = (db.query(TopicTrend)
-                           .filter(
-                               and_(
-                                   TopicTrend.theme == pred.theme,
-                                   TopicTrend.country == pred.country
-                               )
-                           )
-                           .order_by(desc(TopicTrend.date))
-                           .first())
-            
-            current_trend_score = current_trend.trend_score if current_trend else 0.0
-            
-            prediction_data.append(PredictionResponse(
+        prediction_data = [
+            PredictionResponse(
                 theme=pred.theme,
                 country=pred.country,
-                current_trend=current_trend_score,
+                current_trend=current_trend_score if current_trend_score is not None else 0.0,
                 predicted_trend=pred.predicted_trend_score,
                 confidence=pred.confidence,
                 prediction_date=pred.prediction_date
-            ))
+            )
+            for pred, current_trend_score in rows
+        ]
         
         return prediction_data
         
@@ -530,48 +560,69 @@ async def get_predictions(
 @router.get("/articles/search")
 async def search_articles(
     query: NewsSearchQuery = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Search articles with filters"""
     try:
-        # Build query
-        article_query = db.query(Article)
+        # Build filters
+        filters = []
         
-        # Apply filters
-        if query.query:
+        if query.query and len(query.query.strip()) >= MIN_FTS_QUERY_LENGTH:
+            filters.append(
+                Article.search_vector.op('@@')(func.websearch_to_tsquery('english', query.query))
+            )
+        elif query.query:
             search_term = f"%{query.query}%"
-            article_query = article_query.filter(
+            filters.append(
                 Article.title.ilike(search_term) | 
                 Article.content.ilike(search_term)
             )
         
         if query.topics:
-            article_query = article_query.filter(Article.primary_theme.in_(query.topics))
+            filters.append(Article.primary_theme.in_(query.topics))
         
         if query.countries:
-            article_query = article_query.filter(Article.country.in_(query.countries))
+            filters.append(Article.country.in_(query.countries))
         
         if query.start_date:
-            article_query = article_query.filter(Article.published_date >= query.start_date)
+            filters.append(Article.published_date >= query.start_date)
         
         if query.end_date:
-            article_query = article_query.filter(Article.published_date <= query.end_date)
+            filters.append(Article.published_date <= query.end_date)
+        
+        # Fetch the page and the total match count in one round-trip
+        page_query = (
+            select(Article, func.count().over().label('total'))
+            .options(load_only(*ARTICLE_LIST_COLUMNS), SOURCE_NAME_ONLY)
+            .where(*filters)
+            .order_by(desc(Article.published_date))
+            .offset(query.offset)
+            .limit(query.limit)
+        )
+        
+        # Large pages are serialized row by row instead of held in memory
+        if query.limit > STREAM_PAGE_THRESHOLD:
+            result = await db.stream(page_query.execution_options(yield_per=STREAM_YIELD_PER))
+            return StreamingResponse(
+                stream_search_page(db, result, filters, query),
+                media_type="application/json"
+            )
         
-        # Get total count
-        total_count = article_query.count()
+        rows = (await db.execute(page_query)).all()
         
-        # Apply pagination and ordering
-        articles = (article_query.order_by(desc(Article.published_date))
-                   .offset(query.offset)
-                   .limit(query.limit)
-                   .all())
+        articles = [row.Article for row in rows]
+        if rows:
+            total_count = rows[0].total
+        elif query.offset:
+            # Page past the end: the window has no rows to report the total on
+            total_count = await db.scalar(
+                select(func.count()).select_from(Article).where(*filters)
+            )
+        else:
+            total_count = 0
         
         # Convert to response format with source names
-        article_responses = []
-        for article in articles:
-            article_dict = ArticleResponse.from_orm(article).dict()
-            article_dict['source_name'] = article.source.name if article.source else 'Unknown Source'
-            article_responses.append(article_dict)
+        article_responses = [article_payload(article) for article in articles]
         
         return {
             "articles": article_responses,
@@ -590,52 +641,54 @@ async def get_recent_articles(
     limit: int = Query(20, le=100),
     topic: Optional[str] = Query(None),
     country: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get recent articles"""
     try:
         cutoff_time = datetime.now() - timedelta(hours=hours)
         
-        query = (db.query(Article)
-                .filter(Article.published_date >= cutoff_time))
+        query = (select(Article)
+                .options(load_only(*ARTICLE_LIST_COLUMNS), SOURCE_NAME_ONLY)
+                .where(Article.published_date >= cutoff_time))
         
         if topic:
-            query = query.filter(Article.primary_theme == topic)
+            query = query.where(Article.primary_theme == topic)
         
         if country:
-            query = query.filter(Article.country == country)
+            query = query.where(Article.country == country)
         
-        articles = (query.order_by(desc(Article.published_date))
-                   .limit(limit)
-                   .all())
+        articles = (await db.scalars(
+            query.order_by(desc(Article.published_date)).limit(limit)
+        )).all()
         
         # Convert to response format with source names
-        article_responses = []
-        for article in articles:
-            article_dict = ArticleResponse.from_orm(article).dict()
-            article_dict['source_name'] = article.source.name if article.source else 'Unknown Source'
-            article_responses.append(article_dict)
-        
-        return article_responses
+        return [article_payload(article) for article in articles]
         
     except Exception as e:
         logger.error(f"Error getting recent articles: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/statistics")
-async def get_statistics(db: Session = Depends(get_db)):
+async def get_statistics(db: AsyncSession = Depends(get_async_db)):
     """Get aggregation statistics"""
     try:
-        stats = news_aggregator.get_statistics()
+        key = cache_key("statistics")
+        cached = await cache_get_json(key)
+        if cached is not None:
+            return cached
+        
+        # news_aggregator still uses the sync engine; keep it off the event loop
+        stats = await run_in_threadpool(news_aggregator.get_statistics)
         
         # Add more detailed statistics
         # Top countries by article count
-        top_countries = (db.query(Article.country, func.count(Article.id).label('count'))
-                        .filter(Article.country.isnot(None))
-                        .group_by(Article.country)
-                        .order_by(desc('count'))
-                        .limit(10)
-                        .all())
+        top_countries = (await db.execute(
+            select(Article.country, func.count(Article.id).label('count'))
+            .where(Article.country.isnot(None))
+            .group_by(Article.country)
+            .order_by(desc('count'))
+            .limit(10)
+        )).all()
         
         stats['top_countries'] = [
             {"country": country, "article_count": count} 
@@ -644,28 +697,53 @@ async def get_statistics(db: Session = Depends(get_db)):
         
         # Recent activity
         last_hour = datetime.now() - timedelta(hours=1)
-        recent_activity = db.query(Article).filter(Article.scraped_date >= last_hour).count()
+        recent_activity = await db.scalar(
+            select(func.count()).select_from(Article).where(Article.scraped_date >= last_hour)
+        )
         stats['recent_activity_1h'] = recent_activity
         
+        await cache_set_json(key, stats, AGGREGATE_CACHE_TTL)
         return stats
         
     except Exception as e:
         logger.error(f"Error getting statistics: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.post("/refresh")
-async def refresh_news():
-    """Manually trigger news refresh"""
-    try:
-        count = news_aggregator.fetch_and_process_news()
-        return {
-            "message": "News refresh completed",
-            "articles_processed": count,
-            "timestamp": datetime.now().isoformat()
-        }
-    except Exception as e:
-        logger.error(f"Error refreshing news: {e}")
-        raise HTTPException(status_code=500, detail="Failed to refresh news")
+@router.post("/refresh", status_code=202)
+async def refresh_news(background_tasks: BackgroundTasks):
+    """Manually trigger news refresh; runs in the background, poll /refresh/{job_id} for the result"""
+    # The lock token doubles as the job id
+    job_id = await acquire_lock(REFRESH_LOCK_KEY, REFRESH_LOCK_TTL)
+    if job_id is None:
+        # Another refresh is running; nothing was queued, so answer 200 and
+        # point the caller at the running job instead
+        last = await cache_get_json(REFRESH_LAST_KEY) or {}
+        return JSONResponse(status_code=200, content={
+            "status": "already_running",
+            "job_id": await get_lock_owner(REFRESH_LOCK_KEY),
+            "message": "News refresh already in progress",
+            "articles_processed": last.get("articles_processed"),
+            "timestamp": last.get("timestamp")
+        })
+    
+    status = {
+        "status": "running",
+        "job_id": job_id,
+        "message": "News refresh started",
+        "timestamp": datetime.now().isoformat()
+    }
+    await set_refresh_status(job_id, status)
+    background_tasks.add_task(run_refresh_job, job_id)
+    
+    return status
+
+@router.get("/refresh/{job_id}")
+async def get_refresh_status(job_id: str):
+    """Get the status of a news refresh started with POST /refresh"""
+    status = await cache_get_json(REFRESH_JOB_KEY.format(job_id=job_id)) or _refresh_jobs.get(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Refresh job not found")
+    return status
 
 @router.get("/health")
 async def health_check():
@@ -686,63 +764,111 @@ async def test_endpoint():
         "cors_enabled": True
     }
 
-def calculate_topic_analysis(trends: List[TopicTrend], articles: List[Article], topic: str, start_datetime: datetime, end_datetime: datetime) -> Dict[str, Any]:
-    """Calculate comprehensive topic analysis"""
-    from collections import defaultdict
-    import statistics
-    
-    # Basic metrics
-    total_articles = len(articles)
-    active_countries = len(set(article.country for article in articles if article.country))
-    
-    # Time series data for charting
-    daily_counts = defaultdict(int)
-    daily_sentiment = defaultdict(list)
-    
-    # Process articles for time series
-    for article in articles:
-        date_str = article.published_date.strftime('%Y-%m-%d')
-        daily_counts[date_str] += 1
-        if article.sentiment_score is not None:
-            daily_sentiment[date_str].append(article.sentiment_score)
-    
-    # Create time series data
-    time_series = []
-    all_dates = sorted(set(daily_counts.keys()))
+async def set_refresh_status(job_id: str, status: Dict[str, Any]) -> None:
+    """Record refresh job status in Redis and locally"""
+    _refresh_jobs[job_id] = status
+    await cache_set_json(REFRESH_JOB_KEY.format(job_id=job_id), status, REFRESH_JOB_TTL)
+
+async def run_refresh_job(job_id: str) -> None:
+    """Run a news refresh, then record its outcome and release the refresh lock"""
+    try:
+        # Fetching and NLP processing are blocking; keep them off the event loop
+        count = await run_in_threadpool(news_aggregator.fetch_and_process_news)
+        
+        # Cached aggregates are stale once new articles are in
+        await cache_invalidate()
+        clear_analysis_cache()
+        
+        status = {
+            "status": "completed",
+            "job_id": job_id,
+            "message": "News refresh completed",
+            "articles_processed": count,
+            "timestamp": datetime.now().isoformat()
+        }
+        await cache_set_json(REFRESH_LAST_KEY, status, settings.NEWS_FETCH_INTERVAL)
+    except Exception as e:
+        logger.error(f"Error refreshing news: {e}")
+        status = {
+            "status": "failed",
+            "job_id": job_id,
+            "message": "Failed to refresh news",
+            "timestamp": datetime.now().isoformat()
+        }
+    finally:
+        await release_lock(REFRESH_LOCK_KEY, job_id)
     
-    for date_str in all_dates:
-        count = daily_counts[date_str]
-        avg_sentiment = None
-        if daily_sentiment[date_str]:
-            avg_sentiment = statistics.mean(daily_sentiment[date_str])
-        
-        time_series.append({
-            'date': date_str,
+    await set_refresh_status(job_id, status)
+
+def article_payload(article: Article) -> Dict[str, Any]:
+    """Serialize an article for list endpoints, including its source name"""
+    return {
+        'id': article.id,
+        'title': article.title,
+        'url': article.url,
+        'country': article.country,
+        'published_date': article.published_date,
+        'sentiment_score': article.sentiment_score,
+        'primary_theme': article.primary_theme,
+        'source_name': article.source.name if article.source else 'Unknown Source'
+    }
+
+async def stream_search_page(db: AsyncSession, result, filters: List[Any], query: NewsSearchQuery) -> AsyncIterator[bytes]:
+    """Emit a streamed search page as JSON, in the same shape as the buffered response"""
+    total_count = None
+    try:
+        yield b'{"articles":['
+        async for row in result:
+            if total_count is None:
+                total_count = row.total
+            else:
+                yield b','
+            yield orjson.dumps(article_payload(row.Article))
+        
+        if total_count is None:
+            # Empty page: the window has no rows to report the total on
+            total_count = await db.scalar(
+                select(func.count()).select_from(Article).where(*filters)
+            ) if query.offset else 0
+        
+        yield b'],"total_count":%d,"limit":%d,"offset":%d}' % (total_count, query.limit, query.offset)
+    except Exception as e:
+        logger.error(f"Error streaming search results: {e}")
+        raise
+    finally:
+        await result.close()
+
+def calculate_topic_analysis(daily_rows: List[Any], country_rows: List[Any], avg_sentiment: Optional[float], active_countries: int,
+                             top_articles: List[Article], topic: str, start_datetime: datetime, end_datetime: datetime) -> Dict[str, Any]:
+    """Calculate comprehensive topic analysis from per-day and per-country aggregates"""
+    # Time series data for charting; rows are (day, article_count, sentiment_avg) ordered by day
+    time_series = [
+        {
+            'date': day.strftime('%Y-%m-%d'),
             'article_count': count,
-            'sentiment_avg': avg_sentiment
-        })
+            'sentiment_avg': sentiment
+        }
+        for day, count, sentiment in daily_rows
+    ]
+    daily_counts = np.array([count for _, count, _ in daily_rows], dtype=np.int64)
     
-    # Calculate overall sentiment
-    all_sentiments = [a.sentiment_score for a in articles if a.sentiment_score is not None]
-    avg_sentiment = statistics.mean(all_sentiments) if all_sentiments else None
+    # Basic metrics
+    total_articles = int(daily_counts.sum())
     
-    # Find peak activity date
+    # Find peak activity date (ties go to the most recent day)
     peak_date = None
     max_count = 0
-    for date_str, count in daily_counts.items():
-        if count > max_count:
-            max_count = count
-            peak_date = date_str
+    if len(daily_counts):
+        peak = len(daily_counts) - 1 - int(np.argmax(daily_counts[::-1]))
+        peak_date = time_series[peak]['date']
+        max_count = int(daily_counts[peak])
     
     # Calculate trend direction
     trend_direction = "stable"
-    if len(time_series) >= 7:
+    if len(daily_counts) > 7:
         # Compare recent week vs previous week
-        recent_week = time_series[-7:]
-        previous_week = time_series[-14:-7] if len(time_series) >= 14 else time_series[:-7]
-        
-        recent_avg = statistics.mean([d['article_count'] for d in recent_week])
-        previous_avg = statistics.mean([d['article_count'] for d in previous_week])
+        recent_avg = daily_counts[-7:].mean()
+        previous_avg = daily_counts[-14:-7].mean()
         
         if recent_avg > previous_avg * 1.2:
             trend_direction = "rising"
@@ -751,7 +877,7 @@ def calculate_topic_analysis(trends: List[TopicTrend], articles: List[Article],
     
     # Get top stories (5 most recent)
     top_stories = []
-    for article in articles[:5]:
+    for article in top_articles:
         top_stories.append({
             'id': article.id,
             'title': article.title,
@@ -763,17 +889,11 @@ def calculate_topic_analysis(trends: List[TopicTrend], articles: List[Article],
             'summary': article.content[:200] + "..." if article.content and len(article.content) > 200 else article.content
         })
     
-    # Country breakdown
-    country_counts = defaultdict(int)
-    for article in articles:
-        if article.country:
-            country_counts[article.country] += 1
-    
-    top_countries = sorted(
-        [{'country': country, 'article_count': count} for country, count in country_counts.items()],
-        key=lambda x: x['article_count'],
-        reverse=True
-    )[:10]
+    # Country breakdown (already the top 10 by article count)
+    top_countries = [
+        {'country': country, 'article_count': count}
+        for country, count in country_rows
+    ]
     
     return {
         'topic': topic,
@@ -795,13 +915,20 @@ def calculate_topic_analysis(trends: List[TopicTrend], articles: List[Article],
         'analysis_timestamp': datetime.now().isoformat()
     }
 
-def generate_trends_from_articles_fallback(db: Session, topic: Optional[str], start_datetime: datetime, end_datetime: datetime):
-    """Generate trend data from articles when no trends exist"""
-    from collections import defaultdict
-    
+async def generate_trends_from_articles_fallback(db: AsyncSession, theme: Optional[str], start_datetime: datetime, end_datetime: datetime):
+    """
+    Generate trend data from articles when no trends exist. theme is the
+    configured topic name already resolved by the caller, or None for all.
+    """
     try:
-        # Build query for articles
-        query = db.query(Article).filter(
+        # Aggregate articles per country in the database
+        article_count = func.count(Article.id)
+        query = select(
+            Article.country,
+            article_count,
+            func.avg(Article.sentiment_score),
+            func.max(Article.published_date)
+        ).where(
             and_(
                 Article.published_date >= start_datetime,
                 Article.published_date <= end_datetime,
@@ -811,60 +938,26 @@ def generate_trends_from_articles_fallback(db: Session, topic: Optional[str], st
         )
         
         # Filter by topic if provided
-        if topic:
-            matched_topic = None
-            for available_topic in settings.NEWS_TOPICS:
-                if topic.lower() in available_topic.lower() or available_topic.lower() in topic.lower():
-                    matched_topic = available_topic
-                    break
-            
-            if matched_topic:
-                query = query.filter(Article.primary_theme == matched_topic)
-            else:
-                return []
+        if theme:
+            query = query.where(Article.primary_theme == theme)
         
-        articles = query.all()
-        
-        if not articles:
-            return []
-        
-        # Group articles by country
-        country_data = defaultdict(lambda: {
-            'articles': [],
-            'article_count': 0,
-            'sentiment_scores': []
-        })
+        # Most active countries first
+        rows = (await db.execute(
+            query.group_by(Article.country).order_by(article_count.desc())
+        )).all()
         
-        for article in articles:
-            country = article.country
-            country_data[country]['articles'].append(article)
-            country_data[country]['article_count'] += 1
-            if article.sentiment_score is not None:
-                country_data[country]['sentiment_scores'].append(article.sentiment_score)
-        
-        # Generate trend data
-        result = []
-        for country, data in country_data.items():
-            # Calculate trend score based on article count (simple heuristic)
-            article_count = data['article_count']
-            trend_score = min(article_count / 10.0, 1.0)  # Normalize to 0-1, max at 10 articles
-            
-            # Calculate average sentiment
-            sentiment_avg = 0
-            if data['sentiment_scores']:
-                sentiment_avg = sum(data['sentiment_scores']) / len(data['sentiment_scores'])
-            
-            result.append({
+        # Trend score is a simple heuristic on article count: 0-1, max at 10 articles
+        result = [
+            {
                 'country': country,
-                'article_count': article_count,
-                'trend_score': trend_score,
-                'sentiment_avg': sentiment_avg,
-                'latest_date': max(a.published_date for a in data['articles']).isoformat(),
+                'article_count': count,
+                'trend_score': min(count / 10.0, 1.0),
+                'sentiment_avg': sentiment_avg if sentiment_avg is not None else 0,
+                'latest_date': latest_date.isoformat(),
                 'data_points': 1
-            })
-        
-        # Sort by article count (most active countries first)
-        result.sort(key=lambda x: x['article_count'], reverse=True)
+            }
+            for country, count, sentiment_avg, latest_date in rows
+        ]
         
         logger.info(f"Generated fallback trend data for {len(result)} countries")
         return result
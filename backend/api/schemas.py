@@ -1,8 +1,10 @@
-from pydantic import BaseModel, HttpUrl, Field
+from pydantic import BaseModel, HttpUrl, Field, TypeAdapter, field_validator
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import Annotated, List, Optional, Dict, Any
 from enum import Enum
 
+from api.date_utils import to_naive_utc
+
 class NewsTopicEnum(str, Enum):
     POLITICS = "Politics & Elections"
     TECHNOLOGY = "Technology & Innovation"
@@ -28,6 +30,8 @@ class NewsSourceCreate(NewsSourceBase):
     pass
 
 class NewsSourceResponse(NewsSourceBase):
+    # Stored URLs were validated on the way in; skip re-parsing on output
+    url: str
     id: int
     last_updated: datetime
     article_count: Optional[int] = 0
@@ -50,6 +54,8 @@ class ArticleCreate(ArticleBase):
     source_id: int
 
 class ArticleResponse(ArticleBase):
+    # Stored URLs were validated on the way in; skip re-parsing on output
+    url: str
     id: int
     source_id: int
     source_name: Optional[str] = None
@@ -88,10 +94,15 @@ class TopicTrendResponse(TopicTrendBase):
     class Config:
         from_attributes = True
 
+# Validates/serializes a whole list of trend rows in one pydantic-core call
+# instead of building each model from Python
+TrendListAdapter = TypeAdapter(List[TopicTrendResponse])
+
 # API Response Schemas
 class TopicListResponse(BaseModel):
     topics: List[str]
     total_count: int
+    topic_counts: Dict[str, int] = {}
 
 class CountryTopicsResponse(BaseModel):
     country: str
@@ -112,12 +123,23 @@ class PredictionResponse(BaseModel):
     prediction_date: datetime
 
 # Request Schemas
+class PageParams(BaseModel):
+    """Offset pagination query parameters, bounds-checked by pydantic-core"""
+    limit: Annotated[int, Field(gt=0, le=1000)] = 20
+    offset: Annotated[int, Field(ge=0)] = 0
+
 class TrendQuery(BaseModel):
     topic: Optional[str] = None
     country: Optional[str] = None
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
     limit: int = Field(default=100, le=1000)
+    
+    @field_validator('start_date', 'end_date')
+    @classmethod
+    def naive_utc_dates(cls, value: Optional[datetime]) -> Optional[datetime]:
+        """Article and trend dates are stored as naive UTC"""
+        return to_naive_utc(value)
 
 class NewsSearchQuery(BaseModel):
     query: Optional[str] = None
@@ -125,5 +147,11 @@ class NewsSearchQuery(BaseModel):
     countries: Optional[List[str]] = []
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
-    limit: int = Field(default=20, le=100)
-    offset: int = Field(default=0, ge=0) 
\ No newline at end of file
+    limit: int = Field(default=20, gt=0, le=1000)
+    offset: int = Field(default=0, ge=0)
+    
+    @field_validator('start_date', 'end_date')
+    @classmethod
+    def naive_utc_dates(cls, value: Optional[datetime]) -> Optional[datetime]:
+        """Article and trend dates are stored as naive UTC"""
+        return to_naive_utc(value) 
\ No newline at end of file
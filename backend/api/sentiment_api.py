@@ -1,17 +1,111 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
-from typing import List, Dict, Any, Optional
+from fastapi.responses import ORJSONResponse
+from typing import Any, Callable, Dict, List, Optional
 from pydantic import BaseModel
+from datetime import datetime, timedelta
+import contextlib
+import io
 import logging
 import numpy as np
 
 from sentiment_analyzer import sentiment_analyzer
 from trend_analyzer import trend_analyzer
 from database import get_db
+from models import Article
+from sqlalchemy import func
 from sqlalchemy.orm import Session
+from cachetools import TTLCache
+from cachetools.keys import hashkey
+import threading
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(tags=["sentiment"])
+router = APIRouter(tags=["sentiment"], default_response_class=ORJSONResponse)
+
+# Analyzer results only change when news is fetched, so dashboards polling
+# these endpoints share results for a minute; cleared after each refresh
+_analysis_cache = TTLCache(maxsize=128, ttl=60)
+_analysis_cache_lock = threading.Lock()
+
+def _memoized(key: tuple, compute: Callable[[], Any], cacheable: Callable[[Any], bool]) -> Any:
+    """
+    Return the cached result for key, computing it on a miss. Results that
+    fail `cacheable` (the analyzer's error fallbacks) are returned but not
+    stored, so a transient DB failure isn't served for the whole TTL.
+    """
+    with _analysis_cache_lock:
+        result = _analysis_cache.get(key)
+    if result is not None:
+        return result
+    
+    result = compute()
+    if cacheable(result):
+        with _analysis_cache_lock:
+            _analysis_cache[key] = result
+    return result
+
+def _is_analysis(result: Dict[str, Any]) -> bool:
+    return "error" not in result
+
+def _cached_distribution(days: int) -> Dict[str, Any]:
+    return _memoized(
+        hashkey('distribution', days),
+        lambda: trend_analyzer.analyze_sentiment_distribution(days=days),
+        _is_analysis
+    )
+
+def _cached_trends(days: int, min_articles: int) -> Dict[str, Any]:
+    return _memoized(
+        hashkey('trends', days, min_articles),
+        lambda: trend_analyzer.analyze_topic_trends(days=days, min_articles=min_articles),
+        _is_analysis
+    )
+
+def _cached_trending(hours: int, min_articles: int) -> List[Dict[str, Any]]:
+    # get_trending_topics returns [] both for no data and on failure, so only
+    # non-empty results are cached
+    return _memoized(
+        hashkey('trending', hours, min_articles),
+        lambda: trend_analyzer.get_trending_topics(hours=hours, min_articles=min_articles),
+        bool
+    )
+
+def summarize_sentiment(total: int, mean: float, std: float, low: float, high: float,
+                        positive: int, negative: int) -> Dict[str, float]:
+    """Summary dict from aggregated moments and positive/negative counts (±0.1 thresholds)"""
+    return {
+        'average_sentiment': float(mean),
+        'sentiment_std': float(std),
+        'min_sentiment': float(low),
+        'max_sentiment': float(high),
+        'positive_ratio': positive / total,
+        'negative_ratio': negative / total,
+        'neutral_ratio': (total - positive - negative) / total
+    }
+
+# The model and keyword sets are fixed once the analyzer is built, so
+# /model-info renders them once per process
+_SENTIMENT_KEYWORD_COUNTS = {
+    'positive': len(sentiment_analyzer.sentiment_keywords['positive']),
+    'negative': len(sentiment_analyzer.sentiment_keywords['negative']),
+    'neutral': len(sentiment_analyzer.sentiment_keywords['neutral'])
+}
+_model_summary: Optional[str] = None
+
+def _get_model_summary() -> str:
+    """Return the neural model's summary text, captured on first use"""
+    global _model_summary
+    if _model_summary is None:
+        f = io.StringIO()
+        with contextlib.redirect_stdout(f):
+            sentiment_analyzer.model.summary()
+        _model_summary = f.getvalue()
+    return _model_summary
+
+def clear_analysis_cache():
+    """Drop cached analyzer results, e.g. after new articles were ingested"""
+    with _analysis_cache_lock:
+        _analysis_cache.clear()
 
 # Request models
 class TextAnalysisRequest(BaseModel):
@@ -78,7 +172,7 @@ async def get_sentiment_distribution(
 ):
     """Get sentiment distribution across topics and time"""
     try:
-        result = trend_analyzer.analyze_sentiment_distribution(days=days)
+        result = _cached_distribution(days)
         
         if "error" in result:
             raise HTTPException(status_code=404, detail=result["error"])
@@ -99,7 +193,7 @@ async def get_sentiment_trends(
 ):
     """Get sentiment trends across topics"""
     try:
-        result = trend_analyzer.analyze_topic_trends(days=days, min_articles=min_articles)
+        result = _cached_trends(days, min_articles)
         
         if "error" in result:
             raise HTTPException(status_code=404, detail=result["error"])
@@ -136,56 +230,59 @@ async def get_topic_sentiment(
 ):
     """Get detailed sentiment analysis for a specific topic"""
     try:
-        from models import Article
-        from datetime import datetime, timedelta
-        import numpy as np
-        
         cutoff_date = datetime.now() - timedelta(days=days)
         
-        # Get articles for the specific topic
-        articles = db.query(Article).filter(
+        topic_filter = (
             Article.published_date >= cutoff_date,
             Article.primary_theme == topic_name,
             Article.sentiment_score.is_not(None)
-        ).all()
-        
-        if not articles:
+        )
+        
+        # Summary moments and ratio counts are aggregated in the database,
+        # so no per-article rows are shipped to Python
+        score = Article.sentiment_score
+        total, mean, std, low, high, positive, negative = db.query(
+            func.count(),
+            func.avg(score),
+            func.stddev_pop(score),
+            func.min(score),
+            func.max(score),
+            func.count().filter(score > 0.1),
+            func.count().filter(score < -0.1)
+        ).filter(*topic_filter).one()
+        
+        if not total:
             raise HTTPException(status_code=404, detail=f"No articles found for topic '{topic_name}' with sentiment data")
         
-        # Calculate metrics
-        sentiment_scores = [article.sentiment_score for article in articles]
-        
-        # Daily breakdown
-        from collections import defaultdict
-        daily_sentiments = defaultdict(list)
-        for article in articles:
-            date_key = article.published_date.date()
-            daily_sentiments[date_key].append(article.sentiment_score)
-        
-        daily_analysis = {}
-        for date, scores in daily_sentiments.items():
-            daily_analysis[str(date)] = {
-                'average_sentiment': np.mean(scores),
-                'article_count': len(scores),
-                'sentiment_range': [float(np.min(scores)), float(np.max(scores))]
+        # Daily breakdown, one row per day
+        day = func.date(Article.published_date)
+        daily_rows = (db.query(day, func.avg(score), func.count(), func.min(score), func.max(score))
+                     .filter(*topic_filter)
+                     .group_by(day)
+                     .order_by(day)
+                     .all())
+        
+        daily_analysis = {
+            str(date): {
+                'average_sentiment': float(day_mean),
+                'article_count': count,
+                'sentiment_range': [float(day_low), float(day_high)]
             }
+            for date, day_mean, count, day_low, day_high in daily_rows
+        }
         
         # Recent articles with sentiment
-        recent_articles = sorted(articles, key=lambda x: x.published_date, reverse=True)[:10]
+        recent_articles = (db.query(Article.title, Article.url, Article.published_date, Article.sentiment_score)
+                          .filter(*topic_filter)
+                          .order_by(Article.published_date.desc())
+                          .limit(10)
+                          .all())
         
         return {
             'topic': topic_name,
             'analysis_period': days,
-            'total_articles': len(articles),
-            'sentiment_summary': {
-                'average_sentiment': np.mean(sentiment_scores),
-                'sentiment_std': np.std(sentiment_scores),
-                'min_sentiment': float(np.min(sentiment_scores)),
-                'max_sentiment': float(np.max(sentiment_scores)),
-                'positive_ratio': sum(1 for s in sentiment_scores if s > 0.1) / len(sentiment_scores),
-                'negative_ratio': sum(1 for s in sentiment_scores if s < -0.1) / len(sentiment_scores),
-                'neutral_ratio': sum(1 for s in sentiment_scores if -0.1 <= s <= 0.1) / len(sentiment_scores)
-            },
+            'total_articles': total,
+            'sentiment_summary': summarize_sentiment(total, mean, std, low, high, positive, negative),
             'daily_sentiment': daily_analysis,
             'recent_articles': [
                 {
@@ -212,7 +309,7 @@ async def get_trending_topics(
 ):
     """Get trending topics based on volume and sentiment"""
     try:
-        trending_topics = trend_analyzer.get_trending_topics(hours=hours, min_articles=min_articles)
+        trending_topics = _cached_trending(hours, min_articles)
         
         if not trending_topics:
             return {
@@ -240,18 +337,21 @@ async def batch_analyze_texts(request: BatchAnalysisRequest):
         
         results = sentiment_analyzer.batch_analyze(request.texts)
         
-        # Calculate summary statistics
-        sentiment_scores = [r['sentiment_score'] for r in results]
-        labels = [r['sentiment_label'] for r in results]
+        # Calculate summary statistics in one pass over each column
+        sentiment_scores = np.fromiter(
+            (r['sentiment_score'] for r in results),
+            dtype=np.float64,
+            count=len(results)
+        )
+        labels, label_counts = np.unique([r['sentiment_label'] for r in results], return_counts=True)
+        
+        distribution = {'positive': 0, 'negative': 0, 'neutral': 0}
+        distribution.update(zip(labels.tolist(), label_counts.tolist()))
         
         summary = {
             'total_texts': len(request.texts),
-            'average_sentiment': np.mean(sentiment_scores),
-            'sentiment_distribution': {
-                'positive': labels.count('positive'),
-                'negative': labels.count('negative'),
-                'neutral': labels.count('neutral')
-            }
+            'average_sentiment': float(sentiment_scores.mean()),
+            'sentiment_distribution': distribution
         }
         
         return {
@@ -275,24 +375,13 @@ async def get_model_info():
             'max_sequence_length': sentiment_analyzer.max_length,
             'confidence_threshold': sentiment_analyzer.confidence_threshold,
             'methods_available': ['neural', 'rule-based', 'blended'],
-            'sentiment_keywords_count': {
-                'positive': len(sentiment_analyzer.sentiment_keywords['positive']),
-                'negative': len(sentiment_analyzer.sentiment_keywords['negative']),
-                'neutral': len(sentiment_analyzer.sentiment_keywords['neutral'])
-            }
+            'sentiment_keywords_count': _SENTIMENT_KEYWORD_COUNTS
         }
         
         if sentiment_analyzer.model:
             try:
                 # Get model summary if available
-                import io
-                import contextlib
-                
-                f = io.StringIO()
-                with contextlib.redirect_stdout(f):
-                    sentiment_analyzer.model.summary()
-                model_summary = f.getvalue()
-                model_info['model_summary'] = model_summary
+                model_info['model_summary'] = _get_model_summary()
             except Exception:
                 model_info['model_summary'] = 'Model summary not available'
         
@@ -0,0 +1,157 @@
+"""
+Redis cache for API responses that only change when news is re-fetched.
+Caching is skipped when REDIS_URL is not configured or Redis is unreachable.
+"""
+from fastapi.encoders import jsonable_encoder
+from redis.exceptions import RedisError
+from typing import Any, Dict, Optional, Tuple
+import redis.asyncio as redis
+import orjson
+import logging
+import time
+import uuid
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "trendpulse:v1"
+
+# Deletes the lock only while it still holds the caller's token, so a run
+# that outlived its TTL can't release a lock another run has since taken
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+_client: Optional[redis.Redis] = None
+
+# Process-local locks, {key: (token, monotonic expiry)}, used when Redis is
+# unavailable. They only exclude callers within this process, which is all
+# a single-worker deployment without Redis has.
+_local_locks: Dict[str, Tuple[str, float]] = {}
+
+def _local_owner(key: str) -> Optional[str]:
+    """Return the token holding a local lock, dropping it if it has expired"""
+    entry = _local_locks.get(key)
+    if entry is None:
+        return None
+    token, expires_at = entry
+    if expires_at <= time.monotonic():
+        del _local_locks[key]
+        return None
+    return token
+
+def _acquire_local_lock(key: str, token: str, ttl: int) -> Optional[str]:
+    if _local_owner(key) is not None:
+        return None
+    _local_locks[key] = (token, time.monotonic() + ttl)
+    return token
+
+def get_redis() -> Optional[redis.Redis]:
+    """Return the shared Redis client, or None when caching is disabled"""
+    global _client
+    if _client is None and settings.REDIS_URL:
+        _client = redis.Redis.from_url(settings.REDIS_URL)
+    return _client
+
+def cache_key(*parts: Any) -> str:
+    """Build a namespaced cache key, e.g. trendpulse:v1:live:10"""
+    return ":".join([CACHE_PREFIX, *(str(part) for part in parts)])
+
+async def cache_get_json(key: str) -> Optional[Any]:
+    """Return the cached value for key, or None on a miss"""
+    client = get_redis()
+    if client is None:
+        return None
+    
+    try:
+        raw = await client.get(key)
+    except RedisError as e:
+        logger.warning(f"Cache read failed for {key}: {e}")
+        return None
+    
+    return orjson.loads(raw) if raw is not None else None
+
+async def cache_set_json(key: str, obj: Any, ttl: int) -> None:
+    """Store obj as JSON under key for ttl seconds"""
+    client = get_redis()
+    if client is None:
+        return
+    
+    try:
+        await client.setex(key, ttl, orjson.dumps(jsonable_encoder(obj)))
+    except RedisError as e:
+        logger.warning(f"Cache write failed for {key}: {e}")
+
+async def cache_invalidate() -> int:
+    """Drop every cached response, e.g. after new articles were ingested"""
+    client = get_redis()
+    if client is None:
+        return 0
+    
+    try:
+        keys = [key async for key in client.scan_iter(match=f"{CACHE_PREFIX}:*", count=500)]
+        if keys:
+            await client.delete(*keys)
+        return len(keys)
+    except RedisError as e:
+        logger.warning(f"Cache invalidation failed: {e}")
+        return 0
+
+async def acquire_lock(key: str, ttl: int) -> Optional[str]:
+    """
+    Take a single-flight lock for ttl seconds. Returns the owner token, or
+    None if another caller holds it. Without Redis the lock is process-local.
+    """
+    token = uuid.uuid4().hex
+    client = get_redis()
+    if client is None:
+        return _acquire_local_lock(key, token, ttl)
+    
+    try:
+        acquired = await client.set(key, token, nx=True, ex=ttl)
+    except RedisError as e:
+        logger.warning(f"Could not take lock {key}, using a local lock: {e}")
+        return _acquire_local_lock(key, token, ttl)
+    
+    return token if acquired else None
+
+async def get_lock_owner(key: str) -> Optional[str]:
+    """Return the token currently holding a lock, if any"""
+    local_owner = _local_owner(key)
+    client = get_redis()
+    if client is None or local_owner is not None:
+        return local_owner
+    
+    try:
+        owner = await client.get(key)
+    except RedisError as e:
+        logger.warning(f"Could not read lock {key}: {e}")
+        return None
+    
+    return owner.decode() if owner is not None else None
+
+async def release_lock(key: str, token: str) -> None:
+    """Release a lock taken with acquire_lock"""
+    if _local_owner(key) == token:
+        del _local_locks[key]
+        return
+    
+    client = get_redis()
+    if client is None:
+        return
+    
+    try:
+        await client.eval(_RELEASE_LOCK_SCRIPT, 1, key, token)
+    except RedisError as e:
+        logger.warning(f"Could not release lock {key}: {e}")
+
+async def close_redis() -> None:
+    """Close the shared client on shutdown"""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
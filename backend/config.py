@@ -6,6 +6,17 @@ load_dotenv()
 class Settings:
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "postgresql://localhost:5432/trendpulse")
+    # Optional explicit asyncpg URL; derived from DATABASE_URL when empty
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", "")
+    
+    # Connection pool (applies to both the sync and async engines)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "30"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    
+    # Redis response cache (disabled when empty)
+    REDIS_URL: str = os.getenv("REDIS_URL", "")
     
     # API Keys
     NEWS_API_KEY: str = os.getenv("NEWS_API_KEY", "")
@@ -16,6 +27,15 @@ class Settings:
     SECRET_KEY: str = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
     CORS_ORIGINS: list = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:8080").split(",")
     
+    # Authentication
+    JWT_PUBLIC_KEY: str = os.getenv("JWT_PUBLIC_KEY", "")
+    JWKS_URL: str = os.getenv("JWKS_URL", "")
+    JWT_ALGORITHMS: list = os.getenv("JWT_ALGORITHMS", "RS256").split(",")
+    JWT_CACHE_TTL: int = int(os.getenv("JWT_CACHE_TTL", "30"))
+    
+    # Comma-separated API keys accepted for external integrations
+    API_KEYS: list = [key for key in os.getenv("API_KEYS", "").split(",") if key]
+    
     # ML Models
     HUGGINGFACE_CACHE_DIR: str = os.getenv("HUGGINGFACE_CACHE_DIR", "./models_cache")
     MODEL_NAME: str = os.getenv("MODEL_NAME", "distilbert-base-uncased")
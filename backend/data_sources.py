@@ -1,49 +1,173 @@
 import os
-from typing import List, Dict, Any, Optional
+import math
+from typing import Callable, List, Dict, Any, Optional, Tuple
 import requests
-import feedparser
-from newsapi import NewsApiClient
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config import settings
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+import multiprocessing
+import operator
+import threading
+from cachetools import TTLCache
+import orjson
 
 logger = logging.getLogger(__name__)
 
+RSS_FETCH_TIMEOUT = 15
+RSS_MAX_WORKERS = 8
+RSS_BATCH_TIMEOUT = 30
+HISTORICAL_FETCH_WORKERS = 4
+GUARDIAN_TIMEOUT = 20
+# Only the fields _guardian_article reads; 'all' returns the full HTML body and more
+GUARDIAN_FIELDS = 'bodyText,trailText'
+# Identical upstream requests within this window are served from memory
+SOURCE_CACHE_TTL = 120
+# Result pages followed per historical request, fetched concurrently
+HISTORICAL_MAX_PAGES = 5
+HISTORICAL_PAGE_WORKERS = 4
+
+# Concurrent NewsAPI/Guardian requests across all fetch pools. Historical
+# fetches fan out over windows and pages, and without a shared cap a
+# backfill can burst past the providers' rate limits
+API_MAX_CONCURRENCY = 6
+_api_slots = threading.BoundedSemaphore(API_MAX_CONCURRENCY)
+
+@dataclass(slots=True)
+class RawArticle:
+    """An article as returned by a news source, before cleaning and enrichment"""
+    title: Optional[str]
+    content: Optional[str]
+    description: Optional[str]
+    url: str
+    published_date: Optional[datetime]
+    source_name: str
+    source_url: str
+    author: Optional[str] = ''
+    image_url: Optional[str] = ''
+    section: str = ''
+    tags: List[str] = field(default_factory=list)
+    source_type: str = 'unknown'
+
+def _copy_articles(articles: List[RawArticle]) -> List[RawArticle]:
+    """
+    Copy cached articles before handing them out; callers relabel source_type
+    and would otherwise change the cached instances for everyone else
+    """
+    return [replace(article, tags=list(article.tags)) for article in articles]
+
+def _parse_iso(value: Optional[str]) -> Optional[datetime]:
+    """Parse an API's ISO 8601 timestamp (e.g. 2024-01-31T09:15:00Z) to naive UTC"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        logger.warning(f"Failed to parse date '{value}'")
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def _from_struct_time(value) -> Optional[datetime]:
+    """Convert one of feedparser's *_parsed fields, which are UTC, to naive UTC"""
+    return datetime(*value[:6]) if value else None
+
+def _newsapi_article(article: Dict) -> RawArticle:
+    """Normalize one NewsAPI article"""
+    return RawArticle(
+        title=article.get('title', ''),
+        content=article.get('content', ''),
+        description=article.get('description', ''),
+        url=article.get('url', ''),
+        published_date=_parse_iso(article.get('publishedAt')),
+        source_name=article.get('source', {}).get('name', ''),
+        source_url=article.get('url', ''),
+        author=article.get('author', ''),
+        image_url=article.get('urlToImage', '')
+    )
+
+def _guardian_article(item: Dict) -> RawArticle:
+    """Normalize one Guardian search result"""
+    fields = item.get('fields', {})
+    return RawArticle(
+        title=item.get('webTitle', ''),
+        content=fields.get('bodyText', ''),
+        description=fields.get('trailText', ''),
+        url=item.get('webUrl', ''),
+        published_date=_parse_iso(item.get('webPublicationDate')),
+        source_name='The Guardian',
+        source_url='https://theguardian.com',
+        section=item.get('sectionName', ''),
+        tags=[tag.get('webTitle', '') for tag in item.get('tags', [])]
+    )
+
+def _fetch_pages(fetch_page: Callable[[int], Dict], pages: range, source: str) -> List[Dict]:
+    """Fetch follow-up result pages concurrently, in page order; failed pages are logged and skipped"""
+    if not pages:
+        return []
+    
+    responses = []
+    with ThreadPoolExecutor(max_workers=min(len(pages), HISTORICAL_PAGE_WORKERS), thread_name_prefix="news-pages") as executor:
+        fetches = [(page, executor.submit(fetch_page, page)) for page in pages]
+        for page, future in fetches:
+            try:
+                responses.append(future.result())
+            except Exception as e:
+                logger.error(f"Error fetching {source} page {page}: {e}")
+    
+    return responses
+
 class NewsAPISource:
     """NewsAPI.org integration"""
     
     def __init__(self):
-        self.client = NewsApiClient(api_key=settings.NEWS_API_KEY) if settings.NEWS_API_KEY else None
+        self._client = None
+        # Recent headline results keyed by (country, category, page_size), so
+        # repeated country/category lookups don't spend API quota
+        self._headlines_cache = TTLCache(maxsize=256, ttl=SOURCE_CACHE_TTL)
+        self._headlines_lock = threading.Lock()
+    
+    @property
+    def client(self):
+        """The NewsAPI client, imported and created on first use; None without an API key"""
+        if self._client is None and settings.NEWS_API_KEY:
+            from newsapi import NewsApiClient
+            self._client = NewsApiClient(api_key=settings.NEWS_API_KEY)
+        return self._client
         
-    def get_top_headlines(self, country: str = None, category: str = None, page_size: int = 100) -> List[Dict]:
-        """Fetch top headlines from NewsAPI"""
+    def get_top_headlines(self, country: str = None, category: str = None, page_size: int = 100,
+                          use_cache: bool = True) -> List[RawArticle]:
+        """Fetch top headlines from NewsAPI; use_cache=False always asks the API (e.g. health checks)"""
         if not self.client:
             logger.warning("NewsAPI key not configured")
             return []
+        
+        key = (country, category, page_size)
+        if use_cache:
+            with self._headlines_lock:
+                cached = self._headlines_cache.get(key)
+            if cached is not None:
+                return _copy_articles(cached)
             
         try:
-            response = self.client.get_top_headlines(
-                country=country,
-                category=category,
-                page_size=page_size,
-                language='en'
-            )
-            
-            articles = []
-            for article in response.get('articles', []):
-                articles.append({
-                    'title': article.get('title', ''),
-                    'content': article.get('content', ''),
-                    'description': article.get('description', ''),
-                    'url': article.get('url', ''),
-                    'published_date': article.get('publishedAt', ''),
-                    'source_name': article.get('source', {}).get('name', ''),
-                    'source_url': article.get('url', ''),
-                    'author': article.get('author', ''),
-                    'image_url': article.get('urlToImage', '')
-                })
+            with _api_slots:
+                response = self.client.get_top_headlines(
+                    country=country,
+                    category=category,
+                    page_size=page_size,
+                    language='en'
+                )
             
-            return articles
+            articles = [_newsapi_article(article) for article in response.get('articles', [])]
+            # Failures and empty results aren't cached so the next call retries
+            if articles:
+                with self._headlines_lock:
+                    self._headlines_cache[key] = articles
+            return _copy_articles(articles)
             
         except Exception as e:
             logger.error(f"Error fetching from NewsAPI: {e}")
@@ -55,8 +179,9 @@ class NewsAPISource:
                               query: str = None,
                               sources: str = None,
                               page_size: int = 100,
-                              page: int = 1) -> List[Dict]:
-        """Fetch historical articles from NewsAPI using /everything endpoint"""
+                              page: int = 1,
+                              max_pages: int = 1) -> List[RawArticle]:
+        """Fetch historical articles from NewsAPI using /everything endpoint, following up to max_pages pages"""
         if not self.client:
             logger.warning("NewsAPI key not configured")
             return []
@@ -67,30 +192,30 @@ class NewsAPISource:
             to_param = to_date.strftime('%Y-%m-%dT%H:%M:%S')
             
             # Use get_everything for historical data
-            response = self.client.get_everything(
-                q=query,
-                sources=sources,
-                from_param=from_param,
-                to=to_param,
-                language='en',
-                sort_by='publishedAt',
-                page_size=page_size,
-                page=page
-            )
+            def fetch_page(page_number: int) -> Dict:
+                with _api_slots:
+                    return self.client.get_everything(
+                        q=query,
+                        sources=sources,
+                        from_param=from_param,
+                        to=to_param,
+                        language='en',
+                        sort_by='publishedAt',
+                        page_size=page_size,
+                        page=page_number
+                    )
+            
+            # The first page tells how many pages the window has
+            response = fetch_page(page)
+            total_pages = math.ceil(response.get('totalResults', 0) / page_size)
+            last_page = min(total_pages, page + max_pages - 1)
+            responses = [response] + _fetch_pages(fetch_page, range(page + 1, last_page + 1), "NewsAPI")
             
-            articles = []
-            for article in response.get('articles', []):
-                articles.append({
-                    'title': article.get('title', ''),
-                    'content': article.get('content', ''),
-                    'description': article.get('description', ''),
-                    'url': article.get('url', ''),
-                    'published_date': article.get('publishedAt', ''),
-                    'source_name': article.get('source', {}).get('name', ''),
-                    'source_url': article.get('url', ''),
-                    'author': article.get('author', ''),
-                    'image_url': article.get('urlToImage', '')
-                })
+            articles = [
+                _newsapi_article(article)
+                for response in responses
+                for article in response.get('articles', [])
+            ]
             
             logger.info(f"Fetched {len(articles)} historical articles from NewsAPI ({from_param} to {to_param})")
             return articles
@@ -105,19 +230,37 @@ class GuardianAPISource:
     def __init__(self):
         self.api_key = settings.GUARDIAN_API_KEY
         self.base_url = "https://content.guardianapis.com"
+        # Pooled keep-alive connections shared by all Guardian calls (including
+        # the concurrent historical fetches), retrying rate limits and 5xx
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        ))
+        # Recent results keyed by (section, page_size)
+        self._articles_cache = TTLCache(maxsize=64, ttl=SOURCE_CACHE_TTL)
+        self._articles_lock = threading.Lock()
         
-    def get_articles(self, section: str = None, page_size: int = 50) -> List[Dict]:
-        """Fetch articles from Guardian API"""
+    def get_articles(self, section: str = None, page_size: int = 50, use_cache: bool = True) -> List[RawArticle]:
+        """Fetch articles from Guardian API; use_cache=False always asks the API (e.g. health checks)"""
         if not self.api_key:
             logger.warning("Guardian API key not configured")
             return []
+        
+        key = (section, page_size)
+        if use_cache:
+            with self._articles_lock:
+                cached = self._articles_cache.get(key)
+            if cached is not None:
+                return _copy_articles(cached)
             
         try:
             url = f"{self.base_url}/search"
             params = {
                 'api-key': self.api_key,
                 'page-size': page_size,
-                'show-fields': 'all',
+                'show-fields': GUARDIAN_FIELDS,
                 'show-tags': 'keyword',
                 'order-by': 'newest'
             }
@@ -125,27 +268,16 @@ class GuardianAPISource:
             if section:
                 params['section'] = section
                 
-            response = requests.get(url, params=params)
+            with _api_slots:
+                response = self.session.get(url, params=params, timeout=GUARDIAN_TIMEOUT)
             response.raise_for_status()
             
-            data = response.json()
-            articles = []
-            
-            for item in data.get('response', {}).get('results', []):
-                fields = item.get('fields', {})
-                articles.append({
-                    'title': item.get('webTitle', ''),
-                    'content': fields.get('bodyText', ''),
-                    'description': fields.get('trailText', ''),
-                    'url': item.get('webUrl', ''),
-                    'published_date': item.get('webPublicationDate', ''),
-                    'source_name': 'The Guardian',
-                    'source_url': 'https://theguardian.com',
-                    'section': item.get('sectionName', ''),
-                    'tags': [tag.get('webTitle', '') for tag in item.get('tags', [])]
-                })
-            
-            return articles
+            data = orjson.loads(response.content)
+            articles = [_guardian_article(item) for item in data.get('response', {}).get('results', [])]
+            if articles:
+                with self._articles_lock:
+                    self._articles_cache[key] = articles
+            return _copy_articles(articles)
             
         except Exception as e:
             logger.error(f"Error fetching from Guardian API: {e}")
@@ -157,8 +289,9 @@ class GuardianAPISource:
                               section: str = None,
                               query: str = None,
                               page_size: int = 50,
-                              page: int = 1) -> List[Dict]:
-        """Fetch historical articles from Guardian API with date range"""
+                              page: int = 1,
+                              max_pages: int = 1) -> List[RawArticle]:
+        """Fetch historical articles from Guardian API with date range, following up to max_pages pages"""
         if not self.api_key:
             logger.warning("Guardian API key not configured")
             return []
@@ -168,38 +301,34 @@ class GuardianAPISource:
             params = {
                 'api-key': self.api_key,
                 'page-size': page_size,
-                'show-fields': 'all',
+                'show-fields': GUARDIAN_FIELDS,
                 'show-tags': 'keyword',
                 'order-by': 'newest',
                 'from-date': from_date.strftime('%Y-%m-%d'),
-                'to-date': to_date.strftime('%Y-%m-%d'),
-                'page': page
+                'to-date': to_date.strftime('%Y-%m-%d')
             }
             
             if section:
                 params['section'] = section
             if query:
                 params['q'] = query
-                
-            response = requests.get(url, params=params)
-            response.raise_for_status()
             
-            data = response.json()
-            articles = []
+            def fetch_page(page_number: int) -> Dict:
+                with _api_slots:
+                    response = self.session.get(url, params={**params, 'page': page_number}, timeout=GUARDIAN_TIMEOUT)
+                response.raise_for_status()
+                return orjson.loads(response.content).get('response', {})
             
-            for item in data.get('response', {}).get('results', []):
-                fields = item.get('fields', {})
-                articles.append({
-                    'title': item.get('webTitle', ''),
-                    'content': fields.get('bodyText', ''),
-                    'description': fields.get('trailText', ''),
-                    'url': item.get('webUrl', ''),
-                    'published_date': item.get('webPublicationDate', ''),
-                    'source_name': 'The Guardian',
-                    'source_url': 'https://theguardian.com',
-                    'section': item.get('sectionName', ''),
-                    'tags': [tag.get('webTitle', '') for tag in item.get('tags', [])]
-                })
+            # The first page tells how many pages the range has
+            data = fetch_page(page)
+            last_page = min(data.get('pages', 1), page + max_pages - 1)
+            responses = [data] + _fetch_pages(fetch_page, range(page + 1, last_page + 1), "Guardian")
+            
+            articles = [
+                _guardian_article(item)
+                for data in responses
+                for item in data.get('results', [])
+            ]
             
             logger.info(f"Fetched {len(articles)} historical articles from Guardian ({from_date.strftime('%Y-%m-%d')} to {to_date.strftime('%Y-%m-%d')})")
             return articles
@@ -208,44 +337,157 @@ class GuardianAPISource:
             logger.error(f"Error fetching historical articles from Guardian: {e}")
             return []
 
+_tag_term = operator.attrgetter('term')
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    """Return the shared process pool for feed parsing, started on first use"""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            # spawn rather than fork: the API and scheduler processes are multithreaded
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=min(RSS_MAX_WORKERS, os.cpu_count() or 1),
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _parse_pool
+
+def _parse_feed(content: bytes, feed_url: str) -> List[RawArticle]:
+    """Parse a downloaded feed body; module-level so pool workers can run it"""
+    import feedparser
+    
+    feed = feedparser.parse(content)
+    source_name = feed.feed.get('title', '')
+    
+    return [
+        RawArticle(
+            title=entry.get('title', ''),
+            content=entry.get('description', ''),
+            description=entry.get('summary', ''),
+            url=entry.get('link', ''),
+            published_date=_from_struct_time(entry.get('published_parsed')),
+            source_name=source_name,
+            source_url=feed_url,
+            author=entry.get('author', ''),
+            tags=list(map(_tag_term, entry['tags'])) if 'tags' in entry else []
+        )
+        for entry in feed.entries
+    ]
+
 class RSSFeedSource:
     """RSS feed integration for various news sources"""
     
     def __init__(self):
         self.feeds = settings.RSS_FEEDS
-        
-    def get_articles_from_feed(self, feed_url: str) -> List[Dict]:
-        """Fetch articles from a single RSS feed"""
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        # (ETag, Last-Modified) from each feed's last full download, sent back
+        # so unchanged feeds answer 304 and skip the download and the parse
+        self.feed_state: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+    
+    @property
+    def session(self) -> requests.Session:
+        """One keep-alive session for all feeds instead of a fresh connection per fetch"""
+        with self._session_lock:
+            if self._session is None:
+                # feedparser is only needed once feeds are actually fetched
+                import feedparser
+                self._session = requests.Session()
+                self._session.headers['User-Agent'] = feedparser.USER_AGENT
+            return self._session
+    
+    def _download_feed(self, feed_url: str, conditional: bool = True) -> Optional[Tuple[bytes, Optional[str], Optional[str]]]:
+        """
+        Download a feed, returning (body, ETag, Last-Modified), or None if it is
+        unchanged or the request failed. The validators are not stored here;
+        callers record them once the body has parsed, so a failed parse is
+        fetched again in full next time instead of answering 304.
+        """
         try:
-            feed = feedparser.parse(feed_url)
-            articles = []
+            headers = {}
+            if conditional:
+                etag, modified = self.feed_state.get(feed_url, (None, None))
+                if etag:
+                    headers['If-None-Match'] = etag
+                if modified:
+                    headers['If-Modified-Since'] = modified
             
-            for entry in feed.entries:
-                articles.append({
-                    'title': entry.get('title', ''),
-                    'content': entry.get('description', ''),
-                    'description': entry.get('summary', ''),
-                    'url': entry.get('link', ''),
-                    'published_date': entry.get('published', ''),
-                    'source_name': feed.feed.get('title', ''),
-                    'source_url': feed_url,
-                    'author': entry.get('author', ''),
-                    'tags': [tag.term for tag in entry.get('tags', [])]
-                })
+            response = self.session.get(feed_url, headers=headers, timeout=RSS_FETCH_TIMEOUT)
+            if response.status_code == 304:
+                logger.debug(f"RSS feed not modified: {feed_url}")
+                return None
+            response.raise_for_status()
             
-            return articles
+            return response.content, response.headers.get('ETag'), response.headers.get('Last-Modified')
             
         except Exception as e:
             logger.error(f"Error fetching RSS feed {feed_url}: {e}")
+            return None
+        
+    def get_articles_from_feed(self, feed_url: str, conditional: bool = True) -> List[RawArticle]:
+        """Fetch articles from a single RSS feed; returns [] if it is unchanged since the last fetch"""
+        download = self._download_feed(feed_url, conditional)
+        if download is None:
+            return []
+        
+        content, etag, modified = download
+        try:
+            articles = _parse_feed(content, feed_url)
+        except Exception as e:
+            logger.error(f"Error parsing RSS feed {feed_url}: {e}")
             return []
+        
+        self.feed_state[feed_url] = (etag, modified)
+        return articles
     
-    def get_all_articles(self) -> List[Dict]:
+    def get_all_articles(self) -> List[RawArticle]:
         """Fetch articles from all configured RSS feeds"""
         all_articles = []
+        if not self.feeds:
+            return all_articles
+        
+        # Downloads are I/O-bound, so overlap them on threads. The whole batch
+        # gets one deadline so a single slow feed can't hold up the others.
+        workers = min(len(self.feeds), RSS_MAX_WORKERS)
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rss-fetch")
+        try:
+            downloads = [(feed_url, executor.submit(self._download_feed, feed_url)) for feed_url in self.feeds]
+            wait([future for _, future in downloads], timeout=RSS_BATCH_TIMEOUT)
+        finally:
+            # Don't block on stragglers; they finish on their own and, since
+            # _download_feed doesn't touch feed_state, their result is just dropped
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        changed = []
+        for feed_url, future in downloads:
+            # Queued downloads cancelled at shutdown also count as done(). Skipped
+            # feeds keep their old validators, so the next run fetches them in full
+            if not future.done() or future.cancelled():
+                logger.warning(f"RSS feed timed out after {RSS_BATCH_TIMEOUT}s: {feed_url}")
+                continue
+            download = future.result()
+            if download is not None:
+                changed.append((feed_url, *download))
+        
+        if not changed:
+            return all_articles
         
-        for feed_url in self.feeds:
-            articles = self.get_articles_from_feed(feed_url)
-            all_articles.extend(articles)
+        # XML parsing is CPU-bound, so spread it over processes instead of
+        # serializing it on the GIL
+        pool = _get_parse_pool()
+        parses = [
+            (feed_url, validators, pool.submit(_parse_feed, body, feed_url))
+            for feed_url, body, *validators in changed
+        ]
+        for feed_url, validators, future in parses:
+            try:
+                all_articles.extend(future.result())
+            except Exception as e:
+                logger.error(f"Error parsing RSS feed {feed_url}: {e}")
+                continue
+            self.feed_state[feed_url] = tuple(validators)
             
         return all_articles
 
@@ -257,27 +499,36 @@ class NewsSourceManager:
         self.guardian = GuardianAPISource()
         self.rss = RSSFeedSource()
         
-    def fetch_all_news(self, country: str = None) -> List[Dict]:
+    def fetch_all_news(self, country: str = None) -> List[RawArticle]:
         """Fetch news from all available sources"""
         all_articles = []
+        # Sources syndicate the same stories; keep the first copy of each URL
+        # so duplicates never reach processing or the insert path
+        seen_urls = set()
         
-        # Fetch from NewsAPI
-        newsapi_articles = self.newsapi.get_top_headlines(country=country)
-        for article in newsapi_articles:
-            article['source_type'] = 'newsapi'
-        all_articles.extend(newsapi_articles)
-        
-        # Fetch from Guardian
-        guardian_articles = self.guardian.get_articles()
-        for article in guardian_articles:
-            article['source_type'] = 'guardian'
-        all_articles.extend(guardian_articles)
-        
-        # Fetch from RSS feeds
-        rss_articles = self.rss.get_all_articles()
-        for article in rss_articles:
-            article['source_type'] = 'rss'
-        all_articles.extend(rss_articles)
+        # The sources are independent blocking HTTP calls, so fetch them
+        # concurrently; total time is that of the slowest source
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix="news-fetch") as executor:
+            fetches = [
+                ('newsapi', executor.submit(self.newsapi.get_top_headlines, country=country)),
+                ('guardian', executor.submit(self.guardian.get_articles)),
+                ('rss', executor.submit(self.rss.get_all_articles)),
+            ]
+            
+            # Collect in a fixed order so results don't depend on timing
+            for source_type, future in fetches:
+                try:
+                    articles = future.result()
+                except Exception as e:
+                    logger.error(f"Error fetching from {source_type}: {e}")
+                    continue
+                
+                for article in articles:
+                    if not article.url or article.url in seen_urls:
+                        continue
+                    seen_urls.add(article.url)
+                    article.source_type = source_type
+                    all_articles.append(article)
         
         logger.info(f"Fetched {len(all_articles)} articles from all sources")
         return all_articles
@@ -286,91 +537,81 @@ class NewsSourceManager:
                             from_date: datetime, 
                             to_date: datetime,
                             query: str = None,
-                            sources: str = None) -> List[Dict]:
+                            sources: str = None) -> List[RawArticle]:
         """Fetch historical news from all available sources with API keys"""
         all_articles = []
         
-        # Fetch historical data from NewsAPI (requires API key)
-        if self.newsapi.client:
-            try:
-                # Fetch in chunks to handle large date ranges
+        # Every NewsAPI week chunk and the Guardian range are independent
+        # blocking requests, so issue them all at once on a thread pool
+        with ThreadPoolExecutor(max_workers=HISTORICAL_FETCH_WORKERS, thread_name_prefix="news-history") as executor:
+            # Fetch historical data from NewsAPI (requires API key), in
+            # chunks to handle large date ranges
+            newsapi_fetches = []
+            if self.newsapi.client:
                 current_date = from_date
                 while current_date < to_date:
                     chunk_end = min(current_date + timedelta(days=7), to_date)
                     
-                    newsapi_articles = self.newsapi.get_historical_articles(
+                    newsapi_fetches.append(executor.submit(
+                        self.newsapi.get_historical_articles,
                         from_date=current_date,
                         to_date=chunk_end,
                         query=query,
                         sources=sources,
-                        page_size=100
-                    )
-                    
-                    for article in newsapi_articles:
-                        article['source_type'] = 'newsapi_historical'
-                    all_articles.extend(newsapi_articles)
+                        page_size=100,
+                        max_pages=HISTORICAL_MAX_PAGES
+                    ))
                     
                     current_date = chunk_end + timedelta(days=1)
-                    
-                logger.info(f"Fetched {len([a for a in all_articles if a['source_type'] == 'newsapi_historical'])} historical articles from NewsAPI")
-            except Exception as e:
-                logger.error(f"Error fetching historical NewsAPI data: {e}")
-        
-        # Fetch historical data from Guardian (requires API key)
-        if self.guardian.api_key:
-            try:
-                guardian_articles = self.guardian.get_historical_articles(
+            
+            # Fetch historical data from Guardian (requires API key)
+            guardian_fetch = None
+            if self.guardian.api_key:
+                guardian_fetch = executor.submit(
+                    self.guardian.get_historical_articles,
                     from_date=from_date,
                     to_date=to_date,
                     query=query,
-                    page_size=50
+                    page_size=50,
+                    max_pages=HISTORICAL_MAX_PAGES
                 )
-                
-                for article in guardian_articles:
-                    article['source_type'] = 'guardian_historical'
-                all_articles.extend(guardian_articles)
-                
-                logger.info(f"Fetched {len([a for a in all_articles if a['source_type'] == 'guardian_historical'])} historical articles from Guardian")
-            except Exception as e:
-                logger.error(f"Error fetching historical Guardian data: {e}")
+            
+            # Collect in submission order so results don't depend on timing
+            if newsapi_fetches:
+                newsapi_count = 0
+                try:
+                    for future in newsapi_fetches:
+                        newsapi_articles = future.result()
+                        
+                        for article in newsapi_articles:
+                            article.source_type = 'newsapi_historical'
+                        all_articles.extend(newsapi_articles)
+                        newsapi_count += len(newsapi_articles)
+                        
+                    logger.info(f"Fetched {newsapi_count} historical articles from NewsAPI")
+                except Exception as e:
+                    logger.error(f"Error fetching historical NewsAPI data: {e}")
+            
+            if guardian_fetch is not None:
+                try:
+                    guardian_articles = guardian_fetch.result()
+                    
+                    for article in guardian_articles:
+                        article.source_type = 'guardian_historical'
+                    all_articles.extend(guardian_articles)
+                    
+                    logger.info(f"Fetched {len(guardian_articles)} historical articles from Guardian")
+                except Exception as e:
+                    logger.error(f"Error fetching historical Guardian data: {e}")
         
         # RSS feeds cannot provide historical data beyond what's in current feeds
         logger.info(f"Total historical articles fetched: {len(all_articles)}")
         return all_articles
     
-    def get_country_specific_news(self, country_code: str) -> List[Dict]:
+    def get_country_specific_news(self, country_code: str) -> List[RawArticle]:
         """Get news specific to a country"""
         return self.newsapi.get_top_headlines(country=country_code)
     
-    def get_category_news(self, category: str) -> List[Dict]:
+    def get_category_news(self, category: str) -> List[RawArticle]:
         """Get news by category"""
         return self.newsapi.get_top_headlines(category=category)
-
-    def bulk_fetch_historical_data(self, days_back: int = 30, batch_size: int = 7) -> int:
-        """Bulk fetch historical data for the past N days"""
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days_back)
-        
-        logger.info(f"Starting bulk historical fetch for {days_back} days ({start_date} to {end_date})")
-        
-        total_articles = 0
-        current_date = start_date
-        
-        while current_date < end_date:
-            batch_end = min(current_date + timedelta(days=batch_size), end_date)
-            
-            logger.info(f"Fetching batch: {current_date} to {batch_end}")
-            articles = self.fetch_historical_news(
-                from_date=current_date,
-                to_date=batch_end
-            )
-            
-            if articles:
-                # Process and save articles (you would integrate this with news_aggregator)
-                total_articles += len(articles)
-                logger.info(f"Batch completed: {len(articles)} articles")
-            
-            current_date = batch_end
-        
-        logger.info(f"Bulk historical fetch completed: {total_articles} total articles")
-        return total_articles 
\ No newline at end of file
@@ -1,22 +1,78 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import StaticPool, QueuePool, AsyncAdaptedQueuePool
+from typing import AsyncIterator, Optional
 from config import settings
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Shared pool configuration. LIFO checkout keeps a small set of hot
+# connections busy and lets idle ones age out via pool_recycle.
+POOL_OPTIONS = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+    pool_use_lifo=True,
+)
+
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
+    poolclass=QueuePool,
     echo=settings.DEBUG,
+    **POOL_OPTIONS,
 )
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def _async_database_url(url: str) -> str:
+    """Point a postgresql:// URL at the asyncpg driver"""
+    for prefix in ("postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            url = "postgresql+asyncpg://" + url[len(prefix):]
+            break
+    # asyncpg takes `ssl` rather than libpq's `sslmode`
+    return url.replace("sslmode=", "ssl=")
+
+# Async engine for request handlers, so DB waits don't block the event loop.
+# The sync engine above stays in place for the ETL jobs and scripts.
+# Async engines must use AsyncAdaptedQueuePool, not QueuePool.
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or _async_database_url(settings.DATABASE_URL),
+    poolclass=AsyncAdaptedQueuePool,
+    echo=settings.DEBUG,
+    **POOL_OPTIONS,
+)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+async def prewarm_async_pool(size: int = settings.DB_POOL_SIZE) -> int:
+    """
+    Open `size` pooled connections concurrently and return them to the pool,
+    so the first requests after startup don't pay the connect handshake
+    """
+    async def _open():
+        return await async_engine.connect()
+    
+    results = await asyncio.gather(*(_open() for _ in range(size)), return_exceptions=True)
+    
+    opened = 0
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.warning(f"Could not pre-open pooled connection: {result}")
+            continue
+        await result.close()
+        opened += 1
+    
+    return opened
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -35,11 +91,69 @@ def get_db() -> Session:
     finally:
         db.close()
 
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    Async counterpart of get_db for `async def` route handlers,
+    so queries don't block the event loop.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Database session error: {e}")
+            await db.rollback()
+            raise
+
+def _create_unique_index(index, replaces: Optional[str] = None) -> None:
+    """
+    Create a unique index on an existing table if it is missing, first deleting
+    duplicate keys left by older check-then-insert code (the newest created_at
+    of each is kept) and then dropping the non-unique index it replaces. All in
+    one transaction, so a failure leaves the table and old index as they were.
+    """
+    table = index.table.name
+    key_columns = ", ".join(column.name for column in index.columns)
+    with engine.begin() as conn:
+        if not conn.execute(text(f"SELECT to_regclass('{index.name}') IS NULL")).scalar():
+            return
+        
+        deleted = conn.execute(text(
+            f"DELETE FROM {table} WHERE id IN ("
+            f"SELECT id FROM (SELECT id, row_number() OVER ("
+            f"PARTITION BY {key_columns} "
+            f"ORDER BY created_at DESC NULLS LAST, id DESC) AS rn "
+            f"FROM {table}) ranked WHERE rn > 1)"
+        )).rowcount
+        if deleted:
+            logger.info(f"Removed {deleted} duplicate rows from {table} before creating {index.name}")
+        
+        index.create(bind=conn)
+        if replaces:
+            conn.execute(text(f"DROP INDEX IF EXISTS {replaces}"))
+
 def init_db():
     """Initialize database tables"""
     try:
         Base.metadata.create_all(bind=engine)
         logger.info("Database tables created successfully")
+        
+        # create_all() doesn't add new columns to existing tables
+        from models import ARTICLE_SEARCH_DOCUMENT, TOPIC_TREND_DAY_INDEX, TOPIC_PREDICTION_DATE_INDEX
+        with engine.begin() as conn:
+            conn.execute(text(
+                "ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector "
+                f"GENERATED ALWAYS AS ({ARTICLE_SEARCH_DOCUMENT}) STORED"
+            ))
+        
+        # Unique keys the trend and prediction upserts rely on
+        _create_unique_index(TOPIC_TREND_DAY_INDEX, replaces="ix_tt_theme_country_date")
+        _create_unique_index(TOPIC_PREDICTION_DATE_INDEX)
+        
+        # create_all() skips indexes on tables that already exist, so add any
+        # index declared in models.py that the database doesn't have yet
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=engine, checkfirst=True)
     except Exception as e:
         logger.error(f"Error creating database tables: {e}")
-        raise 
\ No newline at end of file
+        raise
@@ -2,7 +2,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import delete, func, text, update
 
 from database import SessionLocal
 from models import Article, NewsSource
@@ -16,6 +16,22 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched and updated per round trip when reprocessing articles
+REPROCESS_BATCH_SIZE = 500
+
+def _estimated_count(db: Session, model) -> int:
+    """
+    Row count from the planner's statistics (pg_class.reltuples) instead of
+    a full COUNT(*) scan; falls back to COUNT(*) if the table was never analyzed
+    """
+    estimate = db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+        {"table": model.__tablename__}
+    ).scalar()
+    if estimate is None or estimate < 0:
+        return db.query(model).count()
+    return estimate
+
 class NewsProcessor:
     """ETL pipeline for news data processing"""
     
@@ -50,7 +66,8 @@ class NewsProcessor:
                 return 0
             
             # Process through the aggregator
-            processed_count = news_aggregator._save_articles_to_db(raw_articles)
+            processed_articles = news_aggregator.article_processor.batch_process_articles(raw_articles)
+            processed_count = news_aggregator._save_articles_to_db(processed_articles)
             
             logger.info(f"Country-specific processing completed: {processed_count} articles for {country_code}")
             return processed_count
@@ -59,28 +76,56 @@ class NewsProcessor:
             logger.error(f"Error fetching country-specific news: {e}")
             return 0
     
+    def bulk_fetch_historical_data(self, days_back: int = 30, batch_size: int = 7) -> int:
+        """Fetch and save historical news for the past N days, one date window at a time"""
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=days_back)
+        
+        logger.info(f"Starting bulk historical fetch for {days_back} days ({start_date} to {end_date})")
+        
+        total_saved = 0
+        current_date = start_date
+        
+        while current_date < end_date:
+            batch_end = min(current_date + timedelta(days=batch_size), end_date)
+            
+            logger.info(f"Fetching batch: {current_date} to {batch_end}")
+            articles = self.source_manager.fetch_historical_news(
+                from_date=current_date,
+                to_date=batch_end
+            )
+            
+            if articles:
+                # Each window is written with multi-row INSERT ... ON CONFLICT DO NOTHING
+                processed_articles = news_aggregator.article_processor.batch_process_articles(articles)
+                saved_count = news_aggregator._save_articles_to_db(processed_articles)
+                total_saved += saved_count
+                logger.info(f"Batch completed: {len(articles)} fetched, {saved_count} saved")
+            
+            current_date = batch_end
+        
+        logger.info(f"Bulk historical fetch completed: {total_saved} total articles saved")
+        return total_saved
+    
     def cleanup_old_articles(self, days: int = 30) -> int:
         """Clean up articles older than specified days"""
         db = SessionLocal()
         try:
             cutoff_date = datetime.now() - timedelta(days=days)
             
-            # Count articles to be deleted
-            old_articles_count = (db.query(Article)
-                                .filter(Article.published_date < cutoff_date)
-                                .count())
+            # Delete old articles in one statement; rowcount doubles as the count
+            result = db.execute(
+                delete(Article)
+                .where(Article.published_date < cutoff_date)
+                .execution_options(synchronize_session=False)
+            )
+            deleted_count = result.rowcount
+            db.commit()
             
-            if old_articles_count == 0:
+            if deleted_count == 0:
                 logger.info("No old articles to clean up")
                 return 0
             
-            # Delete old articles
-            deleted_count = (db.query(Article)
-                           .filter(Article.published_date < cutoff_date)
-                           .delete(synchronize_session=False))
-            
-            db.commit()
-            
             logger.info(f"Cleaned up {deleted_count} articles older than {days} days")
             return deleted_count
             
@@ -93,120 +138,128 @@ class NewsProcessor:
     
     def reprocess_articles_without_topics(self) -> int:
         """Reprocess articles that don't have topic classification"""
-        db = SessionLocal()
         try:
-            # Find articles without primary theme
-            articles_without_topics = (db.query(Article)
-                                     .filter(Article.primary_theme.is_(None))
-                                     .limit(100)  # Process in batches
-                                     .all())
+            processed_count = self._reprocess_articles(
+                Article.primary_theme.is_(None),
+                news_aggregator._process_article_topics
+            )
             
-            if not articles_without_topics:
+            if processed_count == 0:
                 logger.info("No articles without topics found")
                 return 0
             
-            processed_count = 0
-            
-            for article in articles_without_topics:
-                try:
-                    # Reprocess topic classification
-                    text = f"{article.title} {article.content or ''}"
-                    news_aggregator._process_article_topics(article, {"title": article.title, "content": article.content})
-                    
-                    processed_count += 1
-                    
-                    # Commit every 10 articles
-                    if processed_count % 10 == 0:
-                        db.commit()
-                        
-                except Exception as e:
-                    logger.error(f"Error reprocessing article {article.id}: {e}")
-                    continue
-            
-            db.commit()
             logger.info(f"Reprocessed {processed_count} articles for topic classification")
             return processed_count
             
         except Exception as e:
             logger.error(f"Error reprocessing articles: {e}")
-            db.rollback()
             return 0
-        finally:
-            db.close()
     
     def reprocess_articles_without_geography(self) -> int:
         """Reprocess articles that don't have geographic information"""
-        db = SessionLocal()
         try:
-            # Find articles without country information
-            articles_without_geo = (db.query(Article)
-                                  .filter(Article.country.is_(None))
-                                  .limit(100)  # Process in batches
-                                  .all())
+            processed_count = self._reprocess_articles(
+                Article.country.is_(None),
+                news_aggregator._process_article_geography
+            )
             
-            if not articles_without_geo:
+            if processed_count == 0:
                 logger.info("No articles without geography found")
                 return 0
             
-            processed_count = 0
+            logger.info(f"Reprocessed {processed_count} articles for geographic information")
+            return processed_count
+            
+        except Exception as e:
+            logger.error(f"Error reprocessing geography: {e}")
+            return 0
+    
+    def _reprocess_articles(self, missing_filter, process_fn) -> int:
+        """
+        Run process_fn over every article matching missing_filter. Rows are
+        streamed from a server-side cursor and the updates are written from
+        a second session with one bulk UPDATE and commit per batch.
+        """
+        read_db = SessionLocal()
+        write_db = SessionLocal()
+        processed_count = 0
+        updates = []
+        
+        try:
+            rows = (read_db.query(Article.id, Article.title, Article.content)
+                    .filter(missing_filter)
+                    .execution_options(yield_per=REPROCESS_BATCH_SIZE))
             
-            for article in articles_without_geo:
+            for article_id, title, content in rows:
                 try:
-                    # Reprocess geographic information
-                    text = f"{article.title} {article.content or ''}"
-                    news_aggregator._process_article_geography(article, {"title": article.title, "content": article.content})
-                    
+                    row = {'id': article_id}
+                    process_fn(row, {"title": title, "content": content or ''})
                     processed_count += 1
                     
-                    # Commit every 10 articles
-                    if processed_count % 10 == 0:
-                        db.commit()
+                    # Only rows the processor filled in need writing
+                    if len(row) > 1:
+                        updates.append(row)
                         
                 except Exception as e:
-                    logger.error(f"Error reprocessing article {article.id}: {e}")
+                    logger.error(f"Error reprocessing article {article_id}: {e}")
                     continue
+                
+                if len(updates) >= REPROCESS_BATCH_SIZE:
+                    write_db.bulk_update_mappings(Article, updates)
+                    write_db.commit()
+                    updates = []
+            
+            if updates:
+                write_db.bulk_update_mappings(Article, updates)
+                write_db.commit()
             
-            db.commit()
-            logger.info(f"Reprocessed {processed_count} articles for geographic information")
             return processed_count
             
-        except Exception as e:
-            logger.error(f"Error reprocessing geography: {e}")
-            db.rollback()
-            return 0
+        except Exception:
+            write_db.rollback()
+            raise
         finally:
-            db.close()
+            read_db.close()
+            write_db.close()
     
     def update_source_statistics(self) -> Dict[str, Any]:
         """Update statistics for all news sources"""
         db = SessionLocal()
         try:
             source_stats = {}
+            now = datetime.now()
+            
+            # Article counts per source, total and recent (last 24 hours),
+            # in two aggregate queries regardless of the number of sources
+            recent_cutoff = now - timedelta(hours=24)
+            total_counts = dict(db.query(Article.source_id, func.count())
+                                .group_by(Article.source_id)
+                                .all())
+            recent_counts = dict(db.query(Article.source_id, func.count())
+                                 .filter(Article.scraped_date >= recent_cutoff)
+                                 .group_by(Article.source_id)
+                                 .all())
+            
+            # Update last_updated for every source with recent articles at once
+            if recent_counts:
+                db.execute(
+                    update(NewsSource)
+                    .where(NewsSource.id.in_(recent_counts.keys()))
+                    .values(last_updated=now)
+                    .execution_options(synchronize_session=False)
+                )
             
             # Get all sources
             sources = db.query(NewsSource).all()
             
             for source in sources:
-                # Count articles from this source
-                article_count = db.query(Article).filter(Article.source_id == source.id).count()
-                
-                # Count recent articles (last 24 hours)
-                recent_cutoff = datetime.now() - timedelta(hours=24)
-                recent_count = (db.query(Article)
-                              .filter(and_(
-                                  Article.source_id == source.id,
-                                  Article.scraped_date >= recent_cutoff
-                              ))
-                              .count())
-                
-                # Update source last_updated if it has recent articles
-                if recent_count > 0:
-                    source.last_updated = datetime.now()
+                recent_count = recent_counts.get(source.id, 0)
+                last_updated = now if recent_count > 0 else source.last_updated
                 
                 source_stats[source.name] = {
-                    "total_articles": article_count,
+                    "total_articles": total_counts.get(source.id, 0),
                     "recent_articles_24h": recent_count,
-                    "last_updated": source.last_updated.isoformat() if source.last_updated else None
+                    "last_updated": last_updated.isoformat() if last_updated else None
                 }
             
             db.commit()
@@ -223,17 +276,15 @@ class NewsProcessor:
     
     def check_database_health(self) -> bool:
         """Check database connectivity and health"""
+        db = SessionLocal()
         try:
-            db = SessionLocal()
-            
             # Simple query to test connectivity
-            result = db.execute("SELECT 1").fetchone()
-            
-            # Check if we can access main tables
-            article_count = db.query(Article).count()
-            source_count = db.query(NewsSource).count()
+            db.execute(text("SELECT 1")).scalar()
             
-            db.close()
+            # Check if we can access main tables; planner estimates are
+            # enough here and don't scan the tables
+            article_count = _estimated_count(db, Article)
+            source_count = _estimated_count(db, NewsSource)
             
             logger.debug(f"Database health check passed: {article_count} articles, {source_count} sources")
             return True
@@ -241,6 +292,8 @@ class NewsProcessor:
         except Exception as e:
             logger.error(f"Database health check failed: {e}")
             return False
+        finally:
+            db.close()
     
     def check_api_health(self) -> bool:
         """Check external API availability"""
@@ -249,7 +302,8 @@ class NewsProcessor:
             rss_status = True
             try:
                 test_articles = self.source_manager.rss.get_articles_from_feed(
-                    "http://feeds.bbci.co.uk/news/rss.xml"
+                    "http://feeds.bbci.co.uk/news/rss.xml",
+                    conditional=False
                 )
                 if not test_articles:
                     rss_status = False
@@ -260,7 +314,7 @@ class NewsProcessor:
             newsapi_status = True
             try:
                 if self.source_manager.newsapi.client:
-                    test_articles = self.source_manager.newsapi.get_top_headlines(page_size=1)
+                    test_articles = self.source_manager.newsapi.get_top_headlines(page_size=1, use_cache=False)
                     if not test_articles:
                         newsapi_status = False
             except:
@@ -282,8 +336,12 @@ class NewsProcessor:
         try:
             stats = {}
             
-            # Article statistics
-            total_articles = db.query(Article).count()
+            # Article statistics, with/without classification, in one scan
+            total_articles, articles_with_topics, articles_with_geography = db.query(
+                func.count(),
+                func.count(Article.primary_theme),
+                func.count(Article.country)
+            ).one()
             
             # Articles by source
             source_counts = (db.query(NewsSource.name, func.count(Article.id).label('count'))
@@ -291,18 +349,21 @@ class NewsProcessor:
                            .group_by(NewsSource.name)
                            .all())
             
-            # Articles by date (last 7 days)
+            # Articles by date (last 7 days), as one range scan grouped by day
+            today = datetime.now().date()
+            window_start = datetime.combine(today - timedelta(days=6), datetime.min.time())
+            window_end = datetime.combine(today + timedelta(days=1), datetime.min.time())
+            day = func.date(Article.published_date)
+            counts_by_day = dict(db.query(day, func.count())
+                                 .filter(Article.published_date >= window_start,
+                                         Article.published_date < window_end)
+                                 .group_by(day)
+                                 .all())
+            
             date_counts = []
             for i in range(7):
-                date = datetime.now().date() - timedelta(days=i)
-                count = (db.query(Article)
-                        .filter(func.date(Article.published_date) == date)
-                        .count())
-                date_counts.append({"date": date.isoformat(), "count": count})
-            
-            # Articles with/without classification
-            articles_with_topics = db.query(Article).filter(Article.primary_theme.isnot(None)).count()
-            articles_with_geography = db.query(Article).filter(Article.country.isnot(None)).count()
+                date = today - timedelta(days=i)
+                date_counts.append({"date": date.isoformat(), "count": counts_by_day.get(date, 0)})
             
             stats = {
                 "total_articles": total_articles,
@@ -1,4 +1,5 @@
-import schedule
+from apscheduler.schedulers.background import BackgroundScheduler as APScheduler
+from apscheduler.executors.pool import ThreadPoolExecutor
 import time
 import threading
 import logging
@@ -18,19 +19,43 @@ from config import settings
 
 logger = logging.getLogger(__name__)
 
+# Jobs run on their own worker threads, so a long trend calculation
+# doesn't hold up the health check or the hourly fetch
+SCHEDULER_WORKERS = 8
+# A job that fires late (e.g. the process was busy or asleep) still runs if
+# it is no more than this many seconds overdue
+MISFIRE_GRACE_SECONDS = 300
+# Health checks within this many seconds of the last one reuse its result
+HEALTH_CHECK_CACHE_SECONDS = 20
+
 class BackgroundScheduler:
-    """Simple background task scheduler using the schedule library"""
+    """Background task scheduler built on APScheduler"""
     
     def __init__(self):
-        self.running = False
-        self.thread = None
+        # Sleeps until the next fire time instead of polling
+        self._aps = APScheduler(
+            executors={'default': ThreadPoolExecutor(SCHEDULER_WORKERS)},
+            job_defaults={
+                'max_instances': 1,
+                'coalesce': True,
+                'misfire_grace_time': MISFIRE_GRACE_SECONDS
+            }
+        )
         self.news_processor = NewsProcessor()
         self.trend_calculator = TrendCalculator()
+        # (monotonic time, result) of the last health check
+        self._hc_cache = (0.0, None)
+        self._hc_lock = threading.Lock()
         
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGTERM, self._signal_handler)
         signal.signal(signal.SIGINT, self._signal_handler)
     
+    @property
+    def running(self) -> bool:
+        """Whether the underlying APScheduler has been started"""
+        return self._aps.running
+    
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals"""
         logger.info(f"Received signal {signum}, shutting down scheduler...")
@@ -42,16 +67,20 @@ class BackgroundScheduler:
         logger.info("Setting up scheduled jobs...")
         
         # News fetching - every hour
-        schedule.every().hour.do(self._safe_execute, self.fetch_news_job, "news_fetch")
+        self._aps.add_job(self._safe_execute, 'interval', hours=1,
+                          args=(self.fetch_news_job, "news_fetch"), id="news_fetch")
         
-        # Trend calculation - every 6 hours
-        schedule.every(6).hours.do(self._safe_execute, self.calculate_trends_job, "trend_calculation")
+        # Trend calculation - every 6 hours, followed by the prediction warmup
+        self._aps.add_job(self._safe_execute, 'interval', hours=6,
+                          args=(self.calculate_trends_job, "trend_calculation"), id="trend_calculation")
         
         # Daily cleanup - every day at 2 AM
-        schedule.every().day.at("02:00").do(self._safe_execute, self.cleanup_job, "daily_cleanup")
+        self._aps.add_job(self._safe_execute, 'cron', hour=2, minute=0,
+                          args=(self.cleanup_job, "daily_cleanup"), id="daily_cleanup")
         
         # Health check - every 30 minutes
-        schedule.every(30).minutes.do(self._safe_execute, self.health_check_job, "health_check")
+        self._aps.add_job(self._safe_execute, 'interval', minutes=30,
+                          args=(self.health_check_job, "health_check"), id="health_check")
         
         logger.info("Scheduled jobs configured successfully")
     
@@ -96,13 +125,30 @@ class BackgroundScheduler:
             # Calculate trends for all topics and countries
             trend_count = self.trend_calculator.calculate_all_trends()
             
-            logger.info(f"Trend calculation job completed: {trend_count} trends calculated")
-            return {"trends_calculated": trend_count, "status": "success"}
+            # Refresh stored predictions from the trends just written
+            prediction_count = self.trend_calculator.warm_predictions()
+            
+            logger.info(f"Trend calculation job completed: {trend_count} trends calculated, {prediction_count} predictions generated")
+            return {"trends_calculated": trend_count, "predictions_generated": prediction_count, "status": "success"}
             
         except Exception as e:
             logger.error(f"Trend calculation job failed: {e}")
             raise
     
+    def warm_predictions_job(self):
+        """Job to precompute trend predictions"""
+        logger.info("Executing prediction warmup job...")
+        
+        try:
+            prediction_count = self.trend_calculator.warm_predictions()
+            
+            logger.info(f"Prediction warmup job completed: {prediction_count} predictions generated")
+            return {"predictions_generated": prediction_count, "status": "success"}
+            
+        except Exception as e:
+            logger.error(f"Prediction warmup job failed: {e}")
+            raise
+    
     def cleanup_job(self):
         """Job to clean up old data"""
         logger.info("Executing cleanup job...")
@@ -128,45 +174,44 @@ class BackgroundScheduler:
             logger.error(f"Cleanup job failed: {e}")
             raise
     
-    def health_check_job(self):
-        """Job to perform health checks"""
+    def health_check_job(self, force: bool = False):
+        """
+        Job to perform health checks. A burst of checks reuses the last result
+        for a few seconds instead of hitting the DB and APIs each time,
+        unless force is set.
+        """
         logger.debug("Executing health check job...")
         
-        try:
-            # Check database connectivity
-            db_status = self.news_processor.check_database_health()
+        # Serialized so concurrent callers wait for one check rather than each running their own
+        with self._hc_lock:
+            checked_at, cached = self._hc_cache
+            if not force and cached is not None and time.monotonic() - checked_at < HEALTH_CHECK_CACHE_SECONDS:
+                return cached
             
-            # Check external API availability
-            api_status = self.news_processor.check_api_health()
-            
-            # Log status
-            if db_status and api_status:
-                logger.debug("Health check passed")
-            else:
-                logger.warning(f"Health check issues: DB={db_status}, APIs={api_status}")
-            
-            return {
-                "database": db_status,
-                "apis": api_status,
-                "status": "healthy" if db_status and api_status else "degraded"
-            }
-            
-        except Exception as e:
-            logger.error(f"Health check job failed: {e}")
-            raise
-    
-    def run_scheduler(self):
-        """Main scheduler loop"""
-        logger.info("Starting background scheduler...")
-        self.running = True
-        
-        while self.running:
             try:
-                schedule.run_pending()
-                time.sleep(30)  # Check every 30 seconds
+                # Check database connectivity
+                db_status = self.news_processor.check_database_health()
+                
+                # Check external API availability
+                api_status = self.news_processor.check_api_health()
+                
+                # Log status
+                if db_status and api_status:
+                    logger.debug("Health check passed")
+                else:
+                    logger.warning(f"Health check issues: DB={db_status}, APIs={api_status}")
+                
+                result = {
+                    "database": db_status,
+                    "apis": api_status,
+                    "status": "healthy" if db_status and api_status else "degraded"
+                }
+                self._hc_cache = (time.monotonic(), result)
+                return result
+                
             except Exception as e:
-                logger.error(f"Scheduler error: {e}")
-                time.sleep(60)  # Wait longer on error
+                logger.error(f"Health check job failed: {e}")
+                raise
     
     def start(self):
         """Start the scheduler in a background thread"""
@@ -177,9 +222,9 @@ class BackgroundScheduler:
         # Setup jobs
         self.setup_jobs()
         
-        # Start in background thread
-        self.thread = threading.Thread(target=self.run_scheduler, daemon=True)
-        self.thread.start()
+        # APScheduler runs its own daemon thread
+        logger.info("Starting background scheduler...")
+        self._aps.start()
         
         logger.info("Background scheduler started successfully")
     
@@ -190,10 +235,8 @@ class BackgroundScheduler:
             return
         
         logger.info("Stopping background scheduler...")
-        self.running = False
-        
-        if self.thread and self.thread.is_alive():
-            self.thread.join(timeout=10)
+        # Don't block shutdown on a long-running job
+        self._aps.shutdown(wait=False)
         
         logger.info("Background scheduler stopped")
     
@@ -202,6 +245,7 @@ class BackgroundScheduler:
         job_map = {
             "fetch_news": self.fetch_news_job,
             "calculate_trends": self.calculate_trends_job,
+            "warm_predictions": self.warm_predictions_job,
             "cleanup": self.cleanup_job,
             "health_check": self.health_check_job
         }
@@ -215,12 +259,11 @@ class BackgroundScheduler:
     def get_job_status(self):
         """Get status of all scheduled jobs"""
         jobs = []
-        for job in schedule.jobs:
+        for job in self._aps.get_jobs():
             jobs.append({
-                "job": str(job.job_func),
-                "next_run": job.next_run.isoformat() if job.next_run else None,
-                "interval": str(job.interval),
-                "unit": job.unit
+                "job": job.id,
+                "next_run": job.next_run_time.isoformat() if job.next_run_time else None,
+                "trigger": str(job.trigger)
             })
         
         return {
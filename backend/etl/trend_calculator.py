@@ -2,10 +2,11 @@ import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, desc
+from sqlalchemy import and_, case, delete, func, desc, select
+from sqlalchemy.dialects.postgresql import insert
 from collections import defaultdict, Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import numpy as np
-from scipy import stats
 
 from database import SessionLocal
 from models import Article, TopicTrend, TopicPrediction
@@ -18,6 +19,26 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 logger = logging.getLogger(__name__)
 
+# Topic-country combinations processed concurrently. Each one holds a pooled
+# connection while it runs, so stay well inside the sync engine's pool
+TREND_WORKERS = max(1, min(8, settings.DB_POOL_SIZE // 2))
+# Fewest trend data points generate_trend_predictions will fit a line to
+MIN_PREDICTION_POINTS = 7
+# Rows removed per transaction by cleanup, so deletes don't hold long locks
+# against the trend upserts
+CLEANUP_BATCH_SIZE = 10000
+
+def _delete_in_batches(db: Session, model, condition) -> int:
+    """Delete rows matching condition CLEANUP_BATCH_SIZE at a time, committing each batch"""
+    total = 0
+    while True:
+        batch_ids = select(model.id).where(condition).limit(CLEANUP_BATCH_SIZE)
+        deleted = db.execute(delete(model).where(model.id.in_(batch_ids))).rowcount
+        db.commit()
+        total += deleted
+        if deleted < CLEANUP_BATCH_SIZE:
+            return total
+
 class TrendCalculator:
     """Calculate and analyze topic trends over time and geography"""
     
@@ -25,35 +46,54 @@ class TrendCalculator:
         self.smoothing_window = 7  # Days for trend smoothing
         self.prediction_days = 7   # Days to predict ahead
     
-    def calculate_all_trends(self) -> int:
+    def calculate_all_trends(self, days_back: int = 30) -> int:
         """Calculate trends for all topics and countries"""
         logger.info("Starting comprehensive trend calculation...")
         
         total_calculated = 0
         
         try:
-            # Get all different unique combinations of topics and countries
-            db = SessionLocal()
-            
-            combinations = (db.query(Article.primary_theme, Article.country)
-                          .filter(and_(
-                              Article.primary_theme.isnot(None),
-                              Article.country.isnot(None)
-                          ))
-                          .distinct()
-                          .all())
-            
-            db.close()
-            
-            logger.info(f"Found {len(combinations)} topic-country combinations to process")
+            end_date = datetime.now()
+            start_date = end_date - timedelta(days=days_back)
             
-            for topic, country in combinations:
-                try:
-                    trends_count = self.calculate_topic_country_trends(topic, country)
-                    total_calculated += trends_count
-                except Exception as e:
-                    logger.error(f"Error calculating trends for {topic} in {country}: {e}")
-                    continue
+            # Per-day counts for every topic-country combination in one query
+            db = SessionLocal()
+            try:
+                day = func.date(Article.published_date).label('day')
+                rows = (db.query(Article.primary_theme, Article.country, day,
+                                 func.count(Article.id), func.avg(Article.sentiment_score))
+                        .filter(and_(
+                            Article.primary_theme.isnot(None),
+                            Article.country.isnot(None),
+                            Article.published_date >= start_date,
+                            Article.published_date <= end_date
+                        ))
+                        .group_by(Article.primary_theme, Article.country, day)
+                        .all())
+            finally:
+                db.close()
+            
+            daily_counts = defaultdict(dict)
+            daily_sentiment = defaultdict(dict)
+            for topic, country, date, count, sentiment_avg in rows:
+                daily_counts[(topic, country)][date.isoformat()] = count
+                if sentiment_avg is not None:
+                    daily_sentiment[(topic, country)][date.isoformat()] = float(sentiment_avg)
+            
+            logger.info(f"Found {len(daily_counts)} topic-country combinations to process")
+            
+            # Only the upserts touch the DB now, so overlap those
+            with ThreadPoolExecutor(max_workers=TREND_WORKERS, thread_name_prefix="trends") as executor:
+                futures = {
+                    executor.submit(self._save_trends, topic, country, counts, daily_sentiment[(topic, country)]): (topic, country)
+                    for (topic, country), counts in daily_counts.items()
+                }
+                for future in as_completed(futures):
+                    topic, country = futures[future]
+                    try:
+                        total_calculated += future.result()
+                    except Exception as e:
+                        logger.error(f"Error calculating trends for {topic} in {country}: {e}")
             
             logger.info(f"Trend calculation completed: {total_calculated} trends calculated")
             return total_calculated
@@ -72,101 +112,97 @@ class TrendCalculator:
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days_back)
             
-            articles = (db.query(Article)
-                       .filter(and_(
-                           Article.primary_theme == topic,
-                           Article.country == country,
-                           Article.published_date >= start_date,
-                           Article.published_date <= end_date
-                       ))
-                       .order_by(Article.published_date)
-                       .all())
-            
-            if not articles:
-                logger.debug(f"No articles found for {topic} in {country}")
-                return 0
-            
-            # Group articles by date
-            daily_counts = self._group_articles_by_date(articles)
-            
+            # Per-day counts and average sentiment, aggregated in the database
+            day = func.date(Article.published_date).label('day')
+            daily_rows = (db.query(day,
+                                   func.count(Article.id).label('article_count'),
+                                   func.avg(Article.sentiment_score).label('sentiment_avg'))
+                         .filter(and_(
+                             Article.primary_theme == topic,
+                             Article.country == country,
+                             Article.published_date >= start_date,
+                             Article.published_date <= end_date
+                         ))
+                         .group_by(day)
+                         .all())
+        except Exception as e:
+            logger.error(f"Error calculating topic-country trends: {e}")
+            return 0
+        finally:
+            db.close()
+        
+        if not daily_rows:
+            logger.debug(f"No articles found for {topic} in {country}")
+            return 0
+        
+        daily_counts = {row.day.isoformat(): row.article_count for row in daily_rows}
+        sentiment_data = {
+            row.day.isoformat(): float(row.sentiment_avg)
+            for row in daily_rows if row.sentiment_avg is not None
+        }
+        
+        return self._save_trends(topic, country, daily_counts, sentiment_data)
+    
+    def _save_trends(self, topic: str, country: str, daily_counts: Dict[str, int],
+                     sentiment_data: Dict[str, float]) -> int:
+        """Score one combination's daily counts and upsert them as TopicTrend rows"""
+        db = SessionLocal()
+        try:
             # Calculate trend scores
             trend_data = self._calculate_trend_scores(daily_counts)
             
-            # Calculate sentiment if available
-            sentiment_data = self._calculate_sentiment_trends(articles)
-            
-            # Save trends to database
-            saved_count = 0
-            for date_str, trend_info in trend_data.items():
-                try:
-                    # Check if trend already exists
-                    existing_trend = (db.query(TopicTrend)
-                                    .filter(and_(
-                                        TopicTrend.theme == topic,
-                                        TopicTrend.country == country,
-                                        func.date(TopicTrend.date) == datetime.strptime(date_str, '%Y-%m-%d').date()
-                                    ))
-                                    .first())
-                    
-                    if existing_trend:
-                        # Update existing trend
-                        existing_trend.article_count = trend_info['article_count']
-                        existing_trend.trend_score = trend_info['trend_score']
-                        existing_trend.sentiment_avg = sentiment_data.get(date_str)
-                        existing_trend.created_at = datetime.now()
-                    else:
-                        # Create new trend
-                        trend = TopicTrend(
-                            theme=topic,
-                            country=country,
-                            date=datetime.strptime(date_str, '%Y-%m-%d'),
-                            article_count=trend_info['article_count'],
-                            trend_score=trend_info['trend_score'],
-                            sentiment_avg=sentiment_data.get(date_str),
-                            engagement_score=self._calculate_engagement_score(trend_info)
-                        )
-                        db.add(trend)
-                    
-                    saved_count += 1
-                    
-                except Exception as e:
-                    logger.error(f"Error saving trend for {date_str}: {e}")
-                    continue
+            # Upsert every day in one statement instead of a lookup per day
+            rows = [
+                {
+                    'theme': topic,
+                    'country': country,
+                    'date': datetime.strptime(date_str, '%Y-%m-%d'),
+                    'article_count': trend_info['article_count'],
+                    'trend_score': trend_info['trend_score'],
+                    'sentiment_avg': sentiment_data.get(date_str),
+                    'engagement_score': self._calculate_engagement_score(trend_info)
+                }
+                for date_str, trend_info in trend_data.items()
+            ]
+            
+            stmt = insert(TopicTrend)
+            # Existing days keep their engagement score, as before
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['theme', 'country', 'date'],
+                set_={
+                    'article_count': stmt.excluded.article_count,
+                    'trend_score': stmt.excluded.trend_score,
+                    'sentiment_avg': stmt.excluded.sentiment_avg,
+                    'created_at': func.now()
+                }
+            )
+            db.execute(stmt, rows)
+            saved_count = len(rows)
             
             db.commit()
             logger.debug(f"Saved {saved_count} trends for {topic} in {country}")
             return saved_count
             
         except Exception as e:
-            logger.error(f"Error calculating topic-country trends: {e}")
+            logger.error(f"Error saving trends for {topic} in {country}: {e}")
             db.rollback()
             return 0
         finally:
             db.close()
     
-    def _group_articles_by_date(self, articles: List[Article]) -> Dict[str, List[Article]]:
-        """Group articles by publication date"""
-        daily_groups = defaultdict(list)
-        
-        for article in articles:
-            date_str = article.published_date.strftime('%Y-%m-%d')
-            daily_groups[date_str].append(article)
-        
-        return daily_groups
-    
-    def _calculate_trend_scores(self, daily_counts: Dict[str, List[Article]]) -> Dict[str, Dict[str, Any]]:
-        """Calculate trend scores for daily article counts"""
+    def _calculate_trend_scores(self, daily_counts: Dict[str, int]) -> Dict[str, Dict[str, Any]]:
+        """Calculate trend scores from article counts keyed by YYYY-MM-DD"""
         trend_data = {}
         
         # Convert to time series
         dates = sorted(daily_counts.keys())
-        counts = [len(daily_counts[date]) for date in dates]
+        counts = [daily_counts[date] for date in dates]
         
         if len(counts) < 3:
             # Not enough data for trend calculation
             for date in dates:
                 trend_data[date] = {
-                    'article_count': len(daily_counts[date]),
+                    'article_count': daily_counts[date],
                     'trend_score': 0.5,  # Neutral
                     'trend_direction': 'stable'
                 }
@@ -175,72 +211,47 @@ class TrendCalculator:
         # Apply smoothing
         smoothed_counts = self._apply_smoothing(counts)
         
-        # Calculate trends
-        for i, date in enumerate(dates):
-            article_count = len(daily_counts[date])
-            
-            # Calculate trend score based on recent change
-            if i >= 2:
-                # Compare with previous days
-                recent_avg = np.mean(smoothed_counts[max(0, i-2):i+1])
-                older_avg = np.mean(smoothed_counts[max(0, i-6):max(1, i-3)])
-                
-                if older_avg > 0:
-                    trend_score = min(max((recent_avg - older_avg) / older_avg + 0.5, 0), 1)
-                else:
-                    trend_score = 0.5
-                
-                # Determine trend direction
-                if trend_score > 0.6:
-                    direction = 'rising'
-                elif trend_score < 0.4:
-                    direction = 'falling'
-                else:
-                    direction = 'stable'
-            else:
-                trend_score = 0.5
-                direction = 'stable'
-            
-            trend_data[date] = {
-                'article_count': article_count,
-                'trend_score': trend_score,
+        # Compare the mean of the last 3 smoothed days with the 3 days before
+        # them (fewer near the start), using prefix sums for the window means
+        prefix = np.concatenate(([0.0], np.cumsum(smoothed_counts)))
+        positions = np.arange(len(dates))
+        recent_lo = np.maximum(0, positions - 2)
+        recent_avg = (prefix[positions + 1] - prefix[recent_lo]) / (positions + 1 - recent_lo)
+        older_lo = np.maximum(0, positions - 6)
+        older_hi = np.maximum(1, positions - 3)
+        older_avg = (prefix[older_hi] - prefix[older_lo]) / (older_hi - older_lo)
+        
+        has_baseline = (positions >= 2) & (older_avg > 0)
+        change = (recent_avg - older_avg) / np.where(older_avg > 0, older_avg, 1.0)
+        trend_scores = np.where(has_baseline, np.clip(change + 0.5, 0, 1), 0.5)
+        directions = np.select([trend_scores > 0.6, trend_scores < 0.4], ['rising', 'falling'], default='stable')
+        
+        return {
+            date: {
+                'article_count': daily_counts[date],
+                'trend_score': score,
                 'trend_direction': direction
             }
-        
-        return trend_data
+            for date, score, direction in zip(dates, trend_scores.tolist(), directions.tolist())
+        }
     
-    def _apply_smoothing(self, values: List[float], window: Optional[int] = None) -> List[float]:
-        """Apply moving average smoothing"""
+    def _apply_smoothing(self, values: List[float], window: Optional[int] = None) -> np.ndarray:
+        """Apply centred moving average smoothing, truncating the window at the edges"""
+        values = np.asarray(values, dtype=np.float64)
         if window is None:
             window = min(self.smoothing_window, len(values) // 3)
         
         if window <= 1:
             return values
         
-        smoothed = []
-        for i in range(len(values)):
-            start_idx = max(0, i - window // 2)
-            end_idx = min(len(values), i + window // 2 + 1)
-            smoothed.append(np.mean(values[start_idx:end_idx]))
-        
-        return smoothed
-    
-    def _calculate_sentiment_trends(self, articles: List[Article]) -> Dict[str, float]:
-        """Calculate average sentiment by date"""
-        daily_sentiment = defaultdict(list)
-        
-        for article in articles:
-            if article.sentiment_score is not None:
-                date_str = article.published_date.strftime('%Y-%m-%d')
-                daily_sentiment[date_str].append(article.sentiment_score)
-        
-        # Calculate averages
-        sentiment_averages = {}
-        for date_str, sentiments in daily_sentiment.items():
-            if sentiments:
-                sentiment_averages[date_str] = np.mean(sentiments)
+        # Window sums from a prefix-sum array instead of one np.mean per element
+        n = len(values)
+        prefix = np.concatenate(([0.0], np.cumsum(values)))
+        positions = np.arange(n)
+        lo = np.maximum(0, positions - window // 2)
+        hi = np.minimum(n, positions + window // 2 + 1)
         
-        return sentiment_averages
+        return (prefix[hi] - prefix[lo]) / (hi - lo)
     
     def _calculate_engagement_score(self, trend_info: Dict[str, Any]) -> float:
         """Calculate engagement score based on various factors"""
@@ -266,11 +277,13 @@ class TrendCalculator:
                                     TopicTrend.theme == topic,
                                     TopicTrend.country == country
                                 ))
-                                .order_by(TopicTrend.date)
+                                .order_by(desc(TopicTrend.date))
                                 .limit(30)  # Last 30 data points
                                 .all())
+            # Oldest first for the fit
+            historical_trends.reverse()
             
-            if len(historical_trends) < 7:
+            if len(historical_trends) < MIN_PREDICTION_POINTS:
                 logger.warning(f"Insufficient data for prediction: {topic} in {country}")
                 return None
             
@@ -279,8 +292,7 @@ class TrendCalculator:
             scores = [trend.trend_score for trend in historical_trends]
             
             # Simple linear regression for prediction
-            x = np.arange(len(scores))
-            slope, intercept, r_value, p_value, std_err = stats.linregress(x, scores)
+            slope, intercept, r_squared = self._fit_line(scores)
             
             # Predict future value
             future_x = len(scores) + days_ahead
@@ -290,12 +302,14 @@ class TrendCalculator:
             predicted_score = min(max(predicted_score, 0.0), 1.0)
             
             # Calculate confidence based on R-squared
-            confidence = max(0.1, r_value ** 2)  # R-squared as confidence
+            confidence = max(0.1, r_squared)  # R-squared as confidence
             
             # Save prediction to database
             prediction_date = dates[-1] + timedelta(days=days_ahead)
             
-            prediction = TopicPrediction(
+            # One stored prediction per topic, country and target date; a
+            # rerun for the same date replaces it
+            stmt = insert(TopicPrediction).values(
                 theme=topic,
                 country=country,
                 prediction_date=prediction_date,
@@ -303,8 +317,16 @@ class TrendCalculator:
                 confidence=confidence,
                 model_version="linear_regression_v1"
             )
-            
-            db.add(prediction)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['theme', 'country', 'prediction_date'],
+                set_={
+                    'predicted_trend_score': stmt.excluded.predicted_trend_score,
+                    'confidence': stmt.excluded.confidence,
+                    'model_version': stmt.excluded.model_version,
+                    'created_at': func.now()
+                }
+            )
+            db.execute(stmt)
             db.commit()
             
             logger.debug(f"Generated prediction for {topic} in {country}: {predicted_score:.3f} (confidence: {confidence:.3f})")
@@ -326,6 +348,69 @@ class TrendCalculator:
         finally:
             db.close()
     
+    def warm_predictions(self) -> int:
+        """Precompute and store predictions for every combination with enough trend history"""
+        db = SessionLocal()
+        try:
+            combinations = (db.query(TopicTrend.theme, TopicTrend.country)
+                          .group_by(TopicTrend.theme, TopicTrend.country)
+                          .having(func.count(TopicTrend.id) >= MIN_PREDICTION_POINTS)
+                          .all())
+        except Exception as e:
+            logger.error(f"Error listing combinations for predictions: {e}")
+            return 0
+        finally:
+            db.close()
+        
+        logger.info(f"Generating predictions for {len(combinations)} topic-country combinations")
+        
+        generated = 0
+        with ThreadPoolExecutor(max_workers=TREND_WORKERS, thread_name_prefix="predictions") as executor:
+            futures = {
+                executor.submit(self.generate_trend_predictions, topic, country, self.prediction_days): (topic, country)
+                for topic, country in combinations
+            }
+            for future in as_completed(futures):
+                topic, country = futures[future]
+                try:
+                    if future.result() is not None:
+                        generated += 1
+                except Exception as e:
+                    logger.error(f"Error generating prediction for {topic} in {country}: {e}")
+        
+        return generated
+    
+    def get_prediction(self, topic: str, country: str) -> Optional[TopicPrediction]:
+        """Return the newest stored prediction for a topic-country combination, without recomputing"""
+        db = SessionLocal()
+        try:
+            return (db.query(TopicPrediction)
+                   .filter(and_(
+                       TopicPrediction.theme == topic,
+                       TopicPrediction.country == country
+                   ))
+                   .order_by(desc(TopicPrediction.prediction_date))
+                   .first())
+        finally:
+            db.close()
+    
+    @staticmethod
+    def _fit_line(values: List[float]) -> Tuple[float, float, float]:
+        """Least-squares fit of values against 0..n-1, returning (slope, intercept, r_squared)"""
+        x = np.arange(len(values), dtype=np.float64)
+        y = np.asarray(values, dtype=np.float64)
+        dx = x - x.mean()
+        dy = y - y.mean()
+        sxy = float(dx @ dy)
+        sxx = float(dx @ dx)
+        syy = float(dy @ dy)
+        
+        slope = sxy / sxx
+        intercept = float(y.mean()) - slope * float(x.mean())
+        # A flat series has no correlation to explain, as with linregress
+        r_squared = sxy * sxy / (sxx * syy) if syy > 0 else 0.0
+        return slope, intercept, r_squared
+    
     def calculate_global_trends(self) -> Dict[str, Any]:
         """Calculate global trend statistics across all topics and countries"""
         db = SessionLocal()
@@ -391,26 +476,17 @@ class TrendCalculator:
         try:
             cutoff_date = datetime.now() - timedelta(days=days)
             
-            # Count trends to be deleted
-            old_trends_count = (db.query(TopicTrend)
-                              .filter(TopicTrend.date < cutoff_date)
-                              .count())
-            
-            if old_trends_count == 0:
-                logger.info("No old trends to clean up")
-                return 0
-            
-            # Delete old trends
-            deleted_count = (db.query(TopicTrend)
-                           .filter(TopicTrend.date < cutoff_date)
-                           .delete(synchronize_session=False))
+            # Postgres has no DELETE ... LIMIT, so each batch deletes by id
+            deleted_count = _delete_in_batches(db, TopicTrend, TopicTrend.date < cutoff_date)
             
             # Also clean up old predictions
-            old_predictions_count = (db.query(TopicPrediction)
-                                   .filter(TopicPrediction.prediction_date < cutoff_date)
-                                   .delete(synchronize_session=False))
+            old_predictions_count = _delete_in_batches(
+                db, TopicPrediction, TopicPrediction.prediction_date < cutoff_date
+            )
             
-            db.commit()
+            if deleted_count == 0 and old_predictions_count == 0:
+                logger.info("No old trends to clean up")
+                return 0
             
             logger.info(f"Cleaned up {deleted_count} trends and {old_predictions_count} predictions older than {days} days")
             return deleted_count + old_predictions_count
@@ -426,31 +502,20 @@ class TrendCalculator:
         """Get comprehensive trend statistics"""
         db = SessionLocal()
         try:
-            # Basic counts
-            total_trends = db.query(TopicTrend).count()
-            total_predictions = db.query(TopicPrediction).count()
-            
-            # Recent activity
             recent_cutoff = datetime.now() - timedelta(days=7)
-            recent_trends = db.query(TopicTrend).filter(TopicTrend.created_at >= recent_cutoff).count()
-            
-            # Topic coverage
-            topics_with_trends = (db.query(TopicTrend.theme)
-                                .distinct()
-                                .count())
-            
-            countries_with_trends = (db.query(TopicTrend.country)
-                                   .distinct()
-                                   .count())
             
-            # Date range
-            oldest_trend = (db.query(TopicTrend)
-                          .order_by(TopicTrend.date)
-                          .first())
+            # All trend table statistics from a single scan
+            (total_trends, topics_with_trends, countries_with_trends,
+             oldest_date, newest_date, recent_trends) = (
+                db.query(func.count(TopicTrend.id),
+                         func.count(func.distinct(TopicTrend.theme)),
+                         func.count(func.distinct(TopicTrend.country)),
+                         func.min(TopicTrend.date),
+                         func.max(TopicTrend.date),
+                         func.count(case((TopicTrend.created_at >= recent_cutoff, 1))))
+                .one())
             
-            newest_trend = (db.query(TopicTrend)
-                          .order_by(desc(TopicTrend.date))
-                          .first())
+            total_predictions = db.query(func.count(TopicPrediction.id)).scalar()
             
             stats = {
                 'total_trends': total_trends,
@@ -459,8 +524,8 @@ class TrendCalculator:
                 'topics_covered': topics_with_trends,
                 'countries_covered': countries_with_trends,
                 'date_range': {
-                    'oldest': oldest_trend.date.isoformat() if oldest_trend else None,
-                    'newest': newest_trend.date.isoformat() if newest_trend else None
+                    'oldest': oldest_date.isoformat() if oldest_date else None,
+                    'newest': newest_date.isoformat() if newest_date else None
                 }
             }
             
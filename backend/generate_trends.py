@@ -11,6 +11,8 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from database import SessionLocal
 from models import Article, TopicTrend
 
+STREAM_BATCH_SIZE = 2000
+
 def generate_trends_from_articles():
     """Generate trend data from existing articles"""
     db = SessionLocal()
@@ -18,22 +20,33 @@ def generate_trends_from_articles():
     try:
         print("Generating trends from articles...")
         
-        # Get all articles
-        articles = db.query(Article).all()
-        print(f"Found {len(articles)} articles")
+        # Stream the needed columns in batches through a server-side cursor
+        # rather than loading every article into memory at once
+        articles = db.query(
+            Article.country,
+            Article.primary_theme,
+            Article.sentiment_score
+        ).execution_options(stream_results=True).yield_per(STREAM_BATCH_SIZE)
         
-        if not articles:
-            print("No articles found!")
-            return
+        # Group articles by country and topic, keeping running totals
+        # instead of the articles themselves
+        country_topic_counts = defaultdict(lambda: defaultdict(lambda: {'count': 0, 'sum_sent': 0.0, 'n_sent': 0}))
+        total_articles = 0
         
-        # Group articles by country and topic
-        country_topic_counts = defaultdict(lambda: defaultdict(int))
-        country_topic_articles = defaultdict(lambda: defaultdict(list))
+        for country, theme, sentiment_score in articles:
+            total_articles += 1
+            if country and theme:
+                stats = country_topic_counts[country][theme]
+                stats['count'] += 1
+                if sentiment_score is not None:
+                    stats['sum_sent'] += sentiment_score
+                    stats['n_sent'] += 1
         
-        for article in articles:
-            if article.country and article.primary_theme:
-                country_topic_counts[article.country][article.primary_theme] += 1
-                country_topic_articles[article.country][article.primary_theme].append(article)
+        print(f"Found {total_articles} articles")
+        
+        if not total_articles:
+            print("No articles found!")
+            return
         
         print(f"Found data for {len(country_topic_counts)} countries")
         
@@ -42,7 +55,8 @@ def generate_trends_from_articles():
         today = datetime.now().date()
         
         for country, topics in country_topic_counts.items():
-            for topic, count in topics.items():
+            for topic, stats in topics.items():
+                count = stats['count']
                 # Calculate a simple trend score based on article count
                 # More articles = higher trend score
                 trend_score = min(count / 10.0, 1.0)  # Normalize to 0-1
@@ -56,10 +70,9 @@ def generate_trends_from_articles():
                 
                 if not existing:
                     # Calculate average sentiment if available
-                    articles_with_sentiment = [a for a in country_topic_articles[country][topic] if a.sentiment_score is not None]
                     avg_sentiment = None
-                    if articles_with_sentiment:
-                        avg_sentiment = sum(a.sentiment_score for a in articles_with_sentiment) / len(articles_with_sentiment)
+                    if stats['n_sent']:
+                        avg_sentiment = stats['sum_sent'] / stats['n_sent']
                     
                     trend = TopicTrend(
                         theme=topic,
@@ -8,6 +8,13 @@ from collections import Counter
 
 logger = logging.getLogger(__name__)
 
+# Common location phrases
+LOCATION_PATTERNS = [
+    re.compile(r'\bin\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'),  # "in Paris", "in New York"
+    re.compile(r'\bfrom\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'),  # "from London"
+    re.compile(r'\bat\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'),  # "at Berlin"
+]
+
 class GeographicProcessor:
     """Extract and process geographic information from text"""
     
@@ -74,6 +81,16 @@ class GeographicProcessor:
             'moscow': 'Russia',
             'st petersburg': 'Russia'
         }
+        
+        # One precompiled scan per table instead of a regex per name per article
+        self._alias_pattern = self._compile_name_pattern(self.country_aliases)
+        self._city_pattern = self._compile_name_pattern(self.city_to_country)
+    
+    @staticmethod
+    def _compile_name_pattern(names) -> re.Pattern:
+        """Word-bounded alternation of all names, longest first so multi-word names win"""
+        alternation = '|'.join(re.escape(name) for name in sorted(names, key=len, reverse=True))
+        return re.compile(r'\b(?:' + alternation + r')\b')
     
     def _load_spacy_model(self):
         """Load spaCy NLP model for named entity recognition"""
@@ -112,25 +129,17 @@ class GeographicProcessor:
         text_lower = text.lower()
         
         # Look for country names and aliases
-        for alias, country in self.country_aliases.items():
-            if re.search(r'\b' + re.escape(alias) + r'\b', text_lower):
-                locations.append(country.lower())
+        for alias in set(self._alias_pattern.findall(text_lower)):
+            locations.append(self.country_aliases[alias].lower())
         
         # Look for city names
-        for city, country in self.city_to_country.items():
-            if re.search(r'\b' + re.escape(city) + r'\b', text_lower):
-                locations.append(city)
-                locations.append(country.lower())
+        for city in set(self._city_pattern.findall(text_lower)):
+            locations.append(city)
+            locations.append(self.city_to_country[city].lower())
         
         # Common location patterns
-        location_patterns = [
-            r'\bin\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',  # "in Paris", "in New York"
-            r'\bfrom\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',  # "from London"
-            r'\bat\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',  # "at Berlin"
-        ]
-        
-        for pattern in location_patterns:
-            matches = re.findall(pattern, text)
+        for pattern in LOCATION_PATTERNS:
+            matches = pattern.findall(text)
             for match in matches:
                 location = match.strip().lower()
                 if len(location) > 2:
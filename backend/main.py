@@ -1,13 +1,23 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.responses import Response, ORJSONResponse
+from fastapi.routing import APIRoute
+from starlette.routing import Match
+from cachetools import TTLCache
+import hashlib
 import logging
 import sys
+import jwt
 from contextlib import asynccontextmanager
 
 from config import settings
-from database import init_db
+from database import init_db, prewarm_async_pool
+from cache import close_redis
 from api.routes import router as api_router
+from api.dependencies import (
+    prime_signing_keys, get_current_user, get_admin_user, admin_list_context, validate_api_key
+)
 from news_aggregator import news_aggregator
 
 # Configure logging
@@ -32,6 +42,20 @@ async def lifespan(app: FastAPI):
         init_db()
         logger.info("Database initialized successfully")
         
+        # Fill the async connection pool before serving traffic
+        warmed = await prewarm_async_pool()
+        logger.info(f"Connection pool pre-warmed with {warmed} connections")
+        
+        # Shared JWKS client for bearer token verification
+        if settings.JWKS_URL:
+            app.state.jwks = jwt.PyJWKClient(settings.JWKS_URL, cache_keys=True, lifespan=3600)
+            # Load the keys now so requests only do a local lookup
+            try:
+                loaded = prime_signing_keys(app.state.jwks)
+                logger.info(f"JWKS client configured with {loaded} signing keys")
+            except jwt.PyJWTError as e:
+                logger.warning(f"Could not preload JWKS signing keys: {e}")
+        
         # Initialize news sources
         news_aggregator.initialize_sources()
         logger.info("News sources initialized")
@@ -55,6 +79,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down TrendPulse API...")
+    await close_redis()
 
 # Create FastAPI application
 app = FastAPI(
@@ -63,10 +88,86 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
-# Add CORS middleware
+# ETags of recent GET responses keyed by (path, query, bearer token digest).
+# Entries expire so changed data is picked up within ETAG_TTL seconds.
+ETAG_TTL = 60
+_etag_cache = TTLCache(maxsize=10_000, ttl=ETAG_TTL)
+
+# Dependencies that authenticate the caller. Routes using any of them never
+# get an early 304, so a revoked or missing token is still rejected.
+_AUTH_DEPENDENCIES = frozenset({get_current_user, get_admin_user, admin_list_context, validate_api_key})
+_route_requires_auth = {}
+
+def _dependant_requires_auth(dependant) -> bool:
+    """Search a route's dependency tree, including router-level dependencies"""
+    return any(
+        sub.call in _AUTH_DEPENDENCIES or _dependant_requires_auth(sub)
+        for sub in dependant.dependencies
+    )
+
+def _requires_auth(request: Request) -> bool:
+    """Whether the route this request will be dispatched to has an auth dependency"""
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match != Match.FULL:
+            continue
+        if not isinstance(route, APIRoute):
+            return False
+        if route not in _route_requires_auth:
+            _route_requires_auth[route] = _dependant_requires_auth(route.dependant)
+        return _route_requires_auth[route]
+    return False
+
+@app.middleware("http")
+async def conditional_get(request: Request, call_next):
+    """
+    Answer revalidation requests with 304 before routing, so a client holding
+    a fresh ETag skips DB session checkout and the handler entirely. Routes
+    with an auth dependency always run it first and only then answer 304.
+    The ETag is bound to the bearer token that fetched the response.
+    """
+    if request.method != "GET" or not request.url.path.startswith("/api/v1"):
+        return await call_next(request)
+    
+    auth = request.headers.get("authorization", "")
+    cache_key = (
+        request.url.path,
+        request.url.query,
+        hashlib.sha256(auth.encode()).digest()[:16] if auth else b"",
+    )
+    
+    if_none_match = request.headers.get("if-none-match")
+    etag = _etag_cache.get(cache_key)
+    if etag is not None and if_none_match == etag and not _requires_auth(request):
+        return Response(status_code=304, headers={"ETag": etag, "Vary": "Authorization"})
+    
+    response = await call_next(request)
+    # Streamed bodies (no Content-Length) pass through untouched rather than
+    # being buffered here just to hash them
+    if response.status_code != 200 or "content-length" not in response.headers:
+        return response
+    
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    _etag_cache[cache_key] = etag
+    
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag, "Vary": "Authorization"})
+    
+    # Copy the raw header list so repeated headers such as Set-Cookie survive;
+    # the body is unchanged, so its Content-Length still applies
+    buffered = Response(content=body, status_code=200)
+    buffered.raw_headers = list(response.raw_headers)
+    buffered.headers["ETag"] = etag
+    buffered.headers["Cache-Control"] = "private, no-cache"
+    buffered.headers.add_vary_header("Authorization")
+    return buffered
+
+# Add CORS middleware (added after conditional_get so 304s also carry CORS headers)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"] if settings.DEBUG else settings.CORS_ORIGINS,  # Allow all origins in debug mode
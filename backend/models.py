@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, JSON, Boolean, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, JSON, Boolean, ForeignKey, Index, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from database import Base
 import uuid
 from datetime import datetime
 
+# Text indexed for article full-text search
+ARTICLE_SEARCH_DOCUMENT = "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(content, ''))"
+
 class NewsSource(Base):
     __tablename__ = "sources"
     
@@ -50,6 +54,10 @@ class Article(Base):
     language = Column(String(10), default="en")
     word_count = Column(Integer)
     
+    # Full-text search document, maintained by Postgres (deferred so it is
+    # never shipped back with regular article queries)
+    search_vector = deferred(Column(TSVECTOR, Computed(ARTICLE_SEARCH_DOCUMENT, persisted=True)))
+    
     # Relationships
     source = relationship("NewsSource", back_populates="articles")
 
@@ -83,4 +91,32 @@ class TopicPrediction(Base):
     confidence = Column(Float, nullable=False)
     model_version = Column(String(50))
     
-    created_at = Column(DateTime, default=func.now()) 
\ No newline at end of file
+    created_at = Column(DateTime, default=func.now()) 
+
+# Composite indexes matching the WHERE + ORDER BY shapes used by the API routes
+# Unique so the trend calculator can upsert one row per topic, country and day
+TOPIC_TREND_DAY_INDEX = Index('uq_tt_theme_country_date', TopicTrend.theme, TopicTrend.country, TopicTrend.date, unique=True)
+# One stored prediction per topic, country and target date, upserted by the warmup job
+TOPIC_PREDICTION_DATE_INDEX = Index(
+    'uq_tp_theme_country_date',
+    TopicPrediction.theme,
+    TopicPrediction.country,
+    TopicPrediction.prediction_date,
+    unique=True
+)
+Index('ix_tt_country_date', TopicTrend.country, TopicTrend.date.desc())
+Index('ix_tt_created_at_trendscore', TopicTrend.created_at.desc(), TopicTrend.trend_score.desc())
+Index('ix_article_theme_pub', Article.primary_theme, Article.published_date.desc())
+Index('ix_article_country_pub', Article.country, Article.published_date.desc())
+Index('ix_article_scraped', Article.scraped_date.desc())
+Index('ix_article_published', Article.published_date.desc())
+Index('ix_article_fts', Article.search_vector, postgresql_using='gin')
+# Covers the topic sentiment queries (theme + date range, scored articles only)
+# so their aggregates can run as index-only scans
+Index(
+    'ix_article_theme_date_sent',
+    Article.primary_theme,
+    Article.published_date.desc(),
+    postgresql_include=['sentiment_score', 'country'],
+    postgresql_where=Article.sentiment_score.isnot(None)
+)
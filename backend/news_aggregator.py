@@ -2,8 +2,9 @@ import asyncio
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
 
 from database import get_db, SessionLocal
 from models import Article, NewsSource, TopicTrend
@@ -16,6 +17,9 @@ from config import settings
 
 logger = logging.getLogger(__name__)
 
+# Articles per multi-row INSERT when saving a fetch
+BULK_INSERT_BATCH_SIZE = 500
+
 class NewsAggregator:
     """Main news aggregation service"""
     
@@ -118,60 +122,48 @@ class NewsAggregator:
             return 0
     
     def _save_articles_to_db(self, processed_articles: List[Dict[str, Any]]) -> int:
-        """Save processed articles to database"""
+        """Save processed articles to database in batched multi-row inserts"""
         db = SessionLocal()
         saved_count = 0
+        source_ids: Dict[str, int] = {}
         
         try:
-            for article_data in processed_articles:
+            for start in range(0, len(processed_articles), BULK_INSERT_BATCH_SIZE):
+                batch = processed_articles[start:start + BULK_INSERT_BATCH_SIZE]
+                
                 try:
-                    # Find or create source
-                    source = self._get_or_create_source(db, article_data)
-                    
-                    # Check if article already exists
-                    existing = db.query(Article).filter(Article.url == article_data['url']).first()
-                    if existing:
-                        continue
-                    
-                    # Create new article
-                    article = Article(
-                        title=article_data['title'],
-                        content=article_data['content'],
-                        summary=article_data['summary'],
-                        url=article_data['url'],
-                        source_id=source.id,
-                        published_date=article_data['published_date'],
-                        language=article_data['language'],
-                        keywords=article_data['keywords'],
-                        word_count=article_data['word_count']
-                    )
+                    # Skip articles we already have before running the NLP steps on them
+                    urls = [article_data['url'] for article_data in batch]
+                    seen_urls = set(db.scalars(select(Article.url).where(Article.url.in_(urls))))
                     
-                    # Process geographic information
-                    self._process_article_geography(article, article_data)
-                    
-                    # Process topic classification
-                    self._process_article_topics(article, article_data)
+                    rows = []
+                    for article_data in batch:
+                        if article_data['url'] in seen_urls:
+                            continue
+                        seen_urls.add(article_data['url'])
+                        
+                        try:
+                            rows.append(self._build_article_row(db, article_data, source_ids))
+                        except Exception as e:
+                            logger.error(f"Error preparing article: {e}")
                     
-                    # Process sentiment analysis
-                    self._process_article_sentiment(article, article_data)
+                    if rows:
+                        # Articles inserted concurrently by another run are skipped
+                        result = db.execute(
+                            insert(Article)
+                            .on_conflict_do_nothing(index_elements=['url'])
+                            .returning(Article.id),
+                            rows
+                        )
+                        saved_count += len(result.all())
                     
-                    db.add(article)
-                    saved_count += 1
+                    db.commit()
                     
-                    # Commit every 10 articles to avoid large transactions
-                    if saved_count % 10 == 0:
-                        db.commit()
-                        
-                except IntegrityError:
-                    db.rollback()
-                    continue
                 except Exception as e:
-                    logger.error(f"Error saving article: {e}")
+                    logger.error(f"Error saving article batch: {e}")
                     db.rollback()
-                    continue
-            
-            # Final commit
-            db.commit()
+                    # Sources created in the rolled back transaction are gone
+                    source_ids.clear()
             
         except Exception as e:
             logger.error(f"Error in _save_articles_to_db: {e}")
@@ -181,6 +173,43 @@ class NewsAggregator:
         
         return saved_count
     
+    def _build_article_row(self, db: Session, article_data: Dict[str, Any], source_ids: Dict[str, int]) -> Dict[str, Any]:
+        """Build the insert row for one article, including geography, topics and sentiment"""
+        source_name = article_data.get('source_name', 'Unknown')
+        if source_name not in source_ids:
+            source_ids[source_name] = self._get_or_create_source(db, article_data).id
+        
+        # Every row carries the same keys so the batch goes out as one statement
+        row = {
+            'title': article_data['title'],
+            'content': article_data['content'],
+            'summary': article_data['summary'],
+            'url': article_data['url'],
+            'source_id': source_ids[source_name],
+            'published_date': article_data['published_date'],
+            'language': article_data['language'],
+            'keywords': article_data['keywords'],
+            'word_count': article_data['word_count'],
+            'locations': None,
+            'country': None,
+            'confidence_score': 0.0,
+            'primary_theme': None,
+            'secondary_themes': None,
+            'theme_confidence': 0.0,
+            'sentiment_score': None
+        }
+        
+        # Process geographic information
+        self._process_article_geography(row, article_data)
+        
+        # Process topic classification
+        self._process_article_topics(row, article_data)
+        
+        # Process sentiment analysis
+        self._process_article_sentiment(row, article_data)
+        
+        return row
+    
     def _get_or_create_source(self, db: Session, article_data: Dict[str, Any]) -> NewsSource:
         """Get existing source or create new one"""
         source_name = article_data.get('source_name', 'Unknown')
@@ -202,35 +231,35 @@ class NewsAggregator:
         
         return source
     
-    def _process_article_geography(self, article: Article, article_data: Dict[str, Any]):
+    def _process_article_geography(self, row: Dict[str, Any], article_data: Dict[str, Any]):
         """Process geographic information for article"""
         try:
             text = f"{article_data['title']} {article_data['content']}"
             geo_result = self.geo_processor.extract_locations(text)
             
             if geo_result:
-                article.locations = geo_result.get('locations', [])
-                article.country = geo_result.get('primary_country')
-                article.confidence_score = geo_result.get('confidence', 0.0)
+                row['locations'] = geo_result.get('locations', [])
+                row['country'] = geo_result.get('primary_country')
+                row['confidence_score'] = geo_result.get('confidence', 0.0)
             
         except Exception as e:
             logger.error(f"Error processing geography: {e}")
     
-    def _process_article_topics(self, article: Article, article_data: Dict[str, Any]):
+    def _process_article_topics(self, row: Dict[str, Any], article_data: Dict[str, Any]):
         """Process topic classification for article"""
         try:
             text = f"{article_data['title']} {article_data['content']}"
             topic_result = self.topic_classifier.classify_text(text)
             
             if topic_result:
-                article.primary_theme = topic_result.get('primary_topic')
-                article.secondary_themes = topic_result.get('secondary_topics', [])
-                article.theme_confidence = topic_result.get('confidence', 0.0)
+                row['primary_theme'] = topic_result.get('primary_topic')
+                row['secondary_themes'] = topic_result.get('secondary_topics', [])
+                row['theme_confidence'] = topic_result.get('confidence', 0.0)
             
         except Exception as e:
             logger.error(f"Error processing topics: {e}")
     
-    def _process_article_sentiment(self, article: Article, article_data: Dict[str, Any]):
+    def _process_article_sentiment(self, row: Dict[str, Any], article_data: Dict[str, Any]):
         """Process sentiment analysis for article"""
         try:
             # Use the analyze_article method for better title+content analysis
@@ -240,7 +269,7 @@ class NewsAggregator:
             )
             
             if sentiment_result:
-                article.sentiment_score = sentiment_result.get('sentiment_score', 0.0)
+                row['sentiment_score'] = sentiment_result.get('sentiment_score', 0.0)
                 # Store additional sentiment metadata in keywords field if needed
                 if 'details' in sentiment_result:
                     sentiment_meta = {
@@ -258,7 +287,7 @@ class NewsAggregator:
         except Exception as e:
             logger.error(f"Error processing sentiment: {e}")
             # Set default neutral sentiment if processing fails
-            article.sentiment_score = 0.0
+            row['sentiment_score'] = 0.0
     
     def get_recent_articles(self, hours: int = 24, limit: int = 100) -> List[Article]:
         """Get recent articles from database"""
@@ -304,18 +333,23 @@ class NewsAggregator:
         """Get aggregation statistics"""
         db = SessionLocal()
         try:
-            total_articles = db.query(Article).count()
-            total_sources = db.query(NewsSource).count()
+            # Plain COUNT(*) selects; Query.count() wraps the query in a subquery
+            total_articles = db.scalar(select(func.count()).select_from(Article))
+            total_sources = db.scalar(select(func.count()).select_from(NewsSource))
             
-            # Articles by topic
-            topic_counts = {}
-            for topic in settings.NEWS_TOPICS:
-                count = db.query(Article).filter(Article.primary_theme == topic).count()
-                topic_counts[topic] = count
+            # Articles by topic (single GROUP BY)
+            topic_counts = {topic: 0 for topic in settings.NEWS_TOPICS}
+            topic_counts.update(db.execute(
+                select(Article.primary_theme, func.count())
+                .where(Article.primary_theme.in_(settings.NEWS_TOPICS))
+                .group_by(Article.primary_theme)
+            ).all())
             
             # Recent articles (last 24 hours)
             cutoff_time = datetime.now() - timedelta(hours=24)
-            recent_count = db.query(Article).filter(Article.published_date >= cutoff_time).count()
+            recent_count = db.scalar(
+                select(func.count()).select_from(Article).where(Article.published_date >= cutoff_time)
+            )
             
             return {
                 'total_articles': total_articles,
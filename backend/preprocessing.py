@@ -8,6 +8,8 @@ import unicodedata
 from dateutil import parser
 import logging
 
+from data_sources import RawArticle
+
 logger = logging.getLogger(__name__)
 
 class TextPreprocessor:
@@ -145,17 +147,17 @@ class ArticleProcessor:
         self.text_processor = TextPreprocessor()
         self.date_processor = DateTimeProcessor()
     
-    def process_article(self, raw_article: Dict[str, Any]) -> Dict[str, Any]:
+    def process_article(self, raw_article: RawArticle) -> Dict[str, Any]:
         """Process a raw article into clean, structured format"""
         processed = {}
         
         # Clean title
         processed['title'] = self.text_processor.clean_text(
-            raw_article.get('title', '')
+            raw_article.title or ''
         )
         
         # Clean content
-        content = raw_article.get('content', '') or raw_article.get('description', '')
+        content = raw_article.content or raw_article.description or ''
         processed['content'] = self.text_processor.clean_text(content)
         
         # Generate summary (first 200 chars of content)
@@ -165,17 +167,15 @@ class ArticleProcessor:
             processed['summary'] = processed['title']
         
         # Process URL
-        processed['url'] = raw_article.get('url', '')
+        processed['url'] = raw_article.url
         
-        # Process date
-        date_str = raw_article.get('published_date', '')
-        parsed_date = self.date_processor.parse_date(date_str)
-        processed['published_date'] = parsed_date or datetime.now()
+        # Sources hand over an already parsed (naive UTC) date
+        processed['published_date'] = raw_article.published_date or datetime.now()
         
         # Source information
-        processed['source_name'] = raw_article.get('source_name', 'Unknown')
-        processed['source_url'] = raw_article.get('source_url', '')
-        processed['source_type'] = raw_article.get('source_type', 'unknown')
+        processed['source_name'] = raw_article.source_name or 'Unknown'
+        processed['source_url'] = raw_article.source_url
+        processed['source_type'] = raw_article.source_type
         
         # Extract keywords
         text_for_keywords = f"{processed['title']} {processed['content']}"
@@ -188,10 +188,10 @@ class ArticleProcessor:
         processed['language'] = 'en'
         
         # Additional metadata
-        processed['author'] = raw_article.get('author', '')
-        processed['tags'] = raw_article.get('tags', [])
-        processed['section'] = raw_article.get('section', '')
-        processed['image_url'] = raw_article.get('image_url', '')
+        processed['author'] = raw_article.author
+        processed['tags'] = raw_article.tags
+        processed['section'] = raw_article.section
+        processed['image_url'] = raw_article.image_url
         
         return processed
     
@@ -233,7 +233,7 @@ class ArticleProcessor:
         logger.info(f"Deduplicated {len(articles)} -> {len(unique_articles)} articles")
         return unique_articles
     
-    def batch_process_articles(self, raw_articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def batch_process_articles(self, raw_articles: List[RawArticle]) -> List[Dict[str, Any]]:
         """Process a batch of raw articles"""
         processed_articles = []
         
@@ -309,7 +309,8 @@ def run_historical_fetch():
             print(f"📰 Fetched {len(articles)} historical articles")
             
             # Process and save articles using existing aggregator
-            saved_count = news_aggregator._save_articles_to_db(articles)
+            processed_articles = news_aggregator.article_processor.batch_process_articles(articles)
+            saved_count = news_aggregator._save_articles_to_db(processed_articles)
             print(f"💾 Saved {saved_count} new articles to database")
             
             # Calculate trends after adding historical data
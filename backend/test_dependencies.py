@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import base64
+import time
+from datetime import datetime
+
+import jwt
+
+from fastapi import HTTPException
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from api import dependencies
+from api.dependencies import encode_cursor, decode_cursor, validate_cursor_pagination
+from config import settings
+
+TEST_SECRET = "test-secret-for-hs256-signing-0123456789"
+
+def expect_bad_cursor(cursor):
+    try:
+        decode_cursor(cursor)
+    except HTTPException as e:
+        assert e.status_code == 400, f"{cursor!r}: got {e.status_code}"
+    else:
+        raise AssertionError(f"{cursor!r} was accepted")
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(42)) == (42,)
+
+    published = datetime(2024, 5, 1, 9, 30, 15, 123456)
+    assert decode_cursor(encode_cursor(published, 7)) == (published, 7)
+
+    page = validate_cursor_pagination(limit=10, cursor=encode_cursor(published, 7))
+    assert page == {"limit": 10, "cursor": (published, 7)}
+
+def test_tampered_cursor_rejected():
+    def raw(payload: bytes) -> str:
+        return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+    for cursor in [
+        "not a cursor!",            # not base64
+        "é",                        # not ASCII
+        raw(b"{not json"),          # not JSON
+        raw(b'{"id": 1}'),          # not a list
+        raw(b"[]"),                 # empty keyset
+        raw(b"[1, 2, 3]"),          # too many keys
+        raw(b'["1"]'),              # id isn't an int
+        raw(b"[true]"),             # bool is not an id
+        raw(b'["yesterday", 5]'),   # timestamp doesn't parse
+        raw(b"[12345, 5]"),         # timestamp isn't a string
+        encode_cursor(42)[:4],      # cut short to "[42"
+    ]:
+        expect_bad_cursor(cursor)
+
+def with_test_signing(check):
+    """Run check with HS256 verification against TEST_SECRET and an empty token cache"""
+    saved = settings.JWT_PUBLIC_KEY, settings.JWT_ALGORITHMS
+    settings.JWT_PUBLIC_KEY, settings.JWT_ALGORITHMS = TEST_SECRET, ["HS256"]
+    dependencies._JWT_CACHE.clear()
+    try:
+        check()
+    finally:
+        settings.JWT_PUBLIC_KEY, settings.JWT_ALGORITHMS = saved
+        dependencies._JWT_CACHE.clear()
+
+def expect_invalid_token(token):
+    try:
+        dependencies._verify_token(token)
+    except HTTPException as e:
+        assert e is dependencies._INVALID_TOKEN_EXC
+        return e
+    raise AssertionError("token was accepted")
+
+def test_expired_token_not_served_from_cache():
+    def check():
+        now = int(time.time())
+        token = jwt.encode({"sub": "alice", "iat": now, "exp": now + 1}, TEST_SECRET, algorithm="HS256")
+        
+        user = dependencies._verify_token(token)
+        assert user["user_id"] == "alice"
+        # Cached within its lifetime
+        assert dependencies._verify_token(token) is user
+        
+        time.sleep(2.1)
+        expect_invalid_token(token)
+    
+    with_test_signing(check)
+
+def test_invalid_token_negative_cached():
+    def check():
+        first = expect_invalid_token("not-a-jwt")
+        
+        # The second attempt must come from the cache, without decoding again
+        original_decode = jwt.decode
+        def fail_decode(*args, **kwargs):
+            raise AssertionError("cached invalid token was decoded again")
+        jwt.decode = fail_decode
+        try:
+            second = expect_invalid_token("not-a-jwt")
+        finally:
+            jwt.decode = original_decode
+        
+        assert second is first
+        assert second.status_code == 401
+    
+    with_test_signing(check)
+
+if __name__ == "__main__":
+    test_cursor_round_trip()
+    test_tampered_cursor_rejected()
+    test_expired_token_not_served_from_cache()
+    test_invalid_token_negative_cached()
+    print("All dependency checks passed")
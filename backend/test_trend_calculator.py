@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+
+import numpy as np
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from etl.trend_calculator import TrendCalculator
+
+calculator = TrendCalculator()
+rng = np.random.default_rng(42)
+
+def reference_smoothing(values, window):
+    """The original per-element moving average"""
+    if window <= 1:
+        return list(values)
+    smoothed = []
+    for i in range(len(values)):
+        start_idx = max(0, i - window // 2)
+        end_idx = min(len(values), i + window // 2 + 1)
+        smoothed.append(np.mean(values[start_idx:end_idx]))
+    return smoothed
+
+def reference_trend_scores(counts, smoothing_window):
+    """The original per-day trend score loop, returning (score, direction) per day"""
+    window = min(smoothing_window, len(counts) // 3)
+    smoothed_counts = reference_smoothing(counts, window)
+    results = []
+    for i in range(len(counts)):
+        if i >= 2:
+            recent_avg = np.mean(smoothed_counts[max(0, i-2):i+1])
+            older_avg = np.mean(smoothed_counts[max(0, i-6):max(1, i-3)])
+            if older_avg > 0:
+                trend_score = min(max((recent_avg - older_avg) / older_avg + 0.5, 0), 1)
+            else:
+                trend_score = 0.5
+            if trend_score > 0.6:
+                direction = 'rising'
+            elif trend_score < 0.4:
+                direction = 'falling'
+            else:
+                direction = 'stable'
+        else:
+            trend_score = 0.5
+            direction = 'stable'
+        results.append((trend_score, direction))
+    return results
+
+def sample_series(length):
+    """Daily counts with some zero days, so empty baselines are covered too"""
+    counts = rng.integers(0, 20, size=length)
+    counts[rng.random(length) < 0.2] = 0
+    return [int(count) for count in counts]
+
+def test_apply_smoothing_matches_loop():
+    for length in range(3, 31):
+        values = sample_series(length)
+        window = min(calculator.smoothing_window, length // 3)
+        expected = reference_smoothing(values, window)
+        actual = calculator._apply_smoothing(values)
+        assert np.allclose(actual, expected), f"length {length}: {actual} != {expected}"
+
+def test_apply_smoothing_explicit_windows():
+    values = sample_series(30)
+    for window in range(1, 12):
+        expected = reference_smoothing(values, window)
+        actual = calculator._apply_smoothing(values, window=window)
+        assert np.allclose(actual, expected), f"window {window}: {actual} != {expected}"
+
+def test_trend_scores_match_loop():
+    # Lengths below 7 exercise the shortened older windows (i < 6)
+    for length in range(3, 31):
+        counts = sample_series(length)
+        daily_counts = {f"2024-01-{day + 1:02d}": count for day, count in enumerate(counts)}
+        expected = reference_trend_scores(counts, calculator.smoothing_window)
+        
+        trend_data = calculator._calculate_trend_scores(daily_counts)
+        for (date, info), (score, direction), count in zip(sorted(trend_data.items()), expected, counts):
+            assert info['article_count'] == count
+            assert np.isclose(info['trend_score'], score), f"length {length}, {date}: {info['trend_score']} != {score}"
+            assert info['trend_direction'] == direction, f"length {length}, {date}: {info['trend_direction']} != {direction}"
+
+def test_fit_line_matches_polyfit():
+    for length in range(7, 31):
+        scores = rng.random(length).tolist()
+        x = np.arange(length)
+        expected_slope, expected_intercept = np.polyfit(x, scores, 1)
+        expected_r_squared = np.corrcoef(x, scores)[0, 1] ** 2
+        
+        slope, intercept, r_squared = TrendCalculator._fit_line(scores)
+        assert np.isclose(slope, expected_slope)
+        assert np.isclose(intercept, expected_intercept)
+        assert np.isclose(r_squared, expected_r_squared)
+
+def test_fit_line_flat_series():
+    slope, intercept, r_squared = TrendCalculator._fit_line([0.5] * 10)
+    assert slope == 0.0
+    assert np.isclose(intercept, 0.5)
+    assert r_squared == 0.0
+
+if __name__ == "__main__":
+    test_apply_smoothing_matches_loop()
+    test_apply_smoothing_explicit_windows()
+    test_trend_scores_match_loop()
+    test_fit_line_matches_polyfit()
+    test_fit_line_flat_series()
+    print("All trend calculator checks passed")